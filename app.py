@@ -1,48 +1,20 @@
+import hashlib
+import io
+
 import streamlit as st
 import pandas as pd
 
-from pipeline.loader import load_papers
-from pipeline.cleaner import (
-    normalize_columns,
-    clean_abstracts,
-    clean_keywords,
-    infer_source_type,
-    filter_nonempty_keywords,
-)
+from pipeline.loader import SUPPORTED_TYPES
+from pipeline.corpus import prepare_corpus
+from pipeline.keyword_extractor import generate_fallback_keywords
+from pipeline.venues import build_venue_type_map
+from pipeline.filter_index import FilterIndex
+from pipeline.keyword_index import KeywordIndex
 from pipeline.cooccurrence import build_cooccurrence_graph
-from viz.wordclouds import plot_wordcloud
-from viz.network import build_interactive_graph
+from viz.wordclouds import render_wordcloud_png
+from viz.network import render_graph_html
 from viz.timeline import plot_keyword_trend
-
-# -----------------------------
-# Keyword fallback (TF-IDF)
-# -----------------------------
-from sklearn.feature_extraction.text import TfidfVectorizer
-
-
-def generate_fallback_keywords(df, top_k=5):
-    texts = (
-        df["title"].fillna("") + " " + df["abstract"].fillna("")
-    ).tolist()
-
-    vectorizer = TfidfVectorizer(
-        stop_words="english",
-        max_features=1000,
-        ngram_range=(1, 2)
-    )
-
-    X = vectorizer.fit_transform(texts)
-    terms = vectorizer.get_feature_names_out()
-
-    keywords = []
-    for row in X:
-        if row.nnz == 0:
-            keywords.append([])
-        else:
-            idx = row.toarray()[0].argsort()[-top_k:]
-            keywords.append([terms[i] for i in idx])
-
-    return keywords
+from pipeline.timing import start_run, span, current_spans, write_run
 
 
 # -----------------------------
@@ -51,36 +23,90 @@ def generate_fallback_keywords(df, top_k=5):
 st.set_page_config(layout="wide")
 st.title("📚 Conference & Journal Knowledge Landscape")
 
+start_run("app")
+
 # -----------------------------
 # File upload
 # -----------------------------
 uploaded = st.file_uploader(
-    "Upload paper metadata (CSV / JSON)",
-    type=["csv", "json"]
+    "Upload paper metadata (CSV / JSON / JSONL / Parquet / Feather)",
+    type=SUPPORTED_TYPES
 )
 
 if not uploaded:
-    st.info("Upload a CSV or JSON file to begin.")
+    st.info("Upload a CSV, JSON, JSONL, Parquet or Feather file to begin.")
+    write_run()
     st.stop()
 
 # -----------------------------
-# Load & preprocess
+# Load & preprocess (memoized on upload content)
 # -----------------------------
-df = load_papers(uploaded)
-df = normalize_columns(df)
-df = clean_abstracts(df)
-df = clean_keywords(df)
-df = infer_source_type(df)
 
-# -----------------------------
-# Keyword fallback (critical)
-# -----------------------------
-if df["keywords"].apply(len).sum() == 0:
+
+def upload_fingerprint(uploaded_file):
+    """Content hash of the upload, computed once per uploaded file."""
+    if st.session_state.get("upload_file_id") != uploaded_file.file_id:
+        st.session_state["upload_file_id"] = uploaded_file.file_id
+        st.session_state["upload_fingerprint"] = hashlib.sha1(
+            uploaded_file.getvalue()
+        ).hexdigest()
+    return st.session_state["upload_fingerprint"]
+
+
+@st.cache_data(show_spinner="Generating fallback keywords ...", max_entries=8)
+def fallback_keywords(fingerprint, _df, top_k=5):
+    return generate_fallback_keywords(_df, top_k=top_k)
+
+
+# cache_resource hands back the same frame on every rerun (no pickling copy);
+# everything below only derives filtered views from it and never mutates it.
+@st.cache_resource(show_spinner="Loading papers ...", max_entries=4)
+def build_corpus(fingerprint, name, _file_bytes):
+    buf = io.BytesIO(_file_bytes)
+    buf.name = name
+
+    return prepare_corpus(
+        buf,
+        venue_types=build_venue_type_map(),
+        fallback=lambda d: fallback_keywords(fingerprint, d)
+    )
+
+
+@st.cache_resource(max_entries=4)
+def build_filter_index(fingerprint, _df):
+    return FilterIndex(_df)
+
+
+@st.cache_resource(max_entries=4)
+def build_keyword_index(fingerprint, _df):
+    return KeywordIndex(_df)
+
+
+# Keyed by corpus + filter mask, so widget changes that keep the filter
+# (graph size, backbone, word cloud options) reuse the graph unhashed.
+@st.cache_resource(max_entries=8)
+def cooccurrence_graph(fingerprint, filter_key, _df_kw):
+    return build_cooccurrence_graph(_df_kw)
+
+
+with span("fingerprint_upload"):
+    fingerprint = upload_fingerprint(uploaded)
+
+with span("build_corpus") as s:
+    df, used_fallback = build_corpus(fingerprint, uploaded.name, uploaded.getvalue())
+    s["rows_out"] = len(df)
+
+with span("build_filter_index", rows=len(df)):
+    index = build_filter_index(fingerprint, df)
+
+with span("build_keyword_index", rows=len(df)):
+    keyword_index = build_keyword_index(fingerprint, df)
+
+if used_fallback:
     st.info(
         "No author keywords found. "
         "Generating keywords automatically from titles and abstracts."
     )
-    df["keywords"] = generate_fallback_keywords(df)
 
 st.success(f"Loaded {len(df)} papers")
 
@@ -90,14 +116,14 @@ st.success(f"Loaded {len(df)} papers")
 with st.sidebar:
     st.header("Filters")
 
-    source_types = sorted(df["source_type"].dropna().unique())
+    source_types = index.source_types
     selected_sources = st.multiselect(
         "Source Type",
         source_types,
         default=source_types
     )
 
-    year_min, year_max = int(df.year.min()), int(df.year.max())
+    year_min, year_max = index.year_min, index.year_max
     year_range = st.slider(
         "Year Range",
         year_min,
@@ -105,6 +131,17 @@ with st.sidebar:
         (year_min, year_max)
     )
 
+    st.divider()
+    st.header("Word Cloud")
+    wc_max_words = st.slider("Max words", 50, 500, 200, step=50)
+    wc_preview = st.checkbox("Fast low-resolution preview", value=False)
+
+    st.divider()
+    st.header("Knowledge Graph")
+    kg_max_nodes = st.slider("Max nodes", 25, 500, 150, step=25)
+    kg_backbone = st.selectbox("Backbone", ["disparity", "percentile"])
+    kg_collapse = st.checkbox("Collapse communities", value=False)
+
     st.divider()
     st.header("Debug / Inspection")
     debug_mode = st.checkbox("Enable inspection mode", value=False)
@@ -112,10 +149,17 @@ with st.sidebar:
 # -----------------------------
 # Apply filters
 # -----------------------------
-df_f = df[
-    (df["source_type"].isin(selected_sources)) &
-    (df["year"].between(*year_range))
-]
+with span("apply_filters", rows=len(df)) as s:
+    mask = index.mask(selected_sources, year_range)
+    df_f = df.iloc[index.rows(mask)]
+
+    # Rows with at least one keyword, shared by the word cloud and the graph.
+    df_kw = df.iloc[index.rows(mask & index.nonempty_keywords)]
+    filter_key = hashlib.sha1(mask.tobytes()).hexdigest()
+    s["rows_out"] = len(df_f)
+
+with span("keyword_frequencies", rows=len(df_f)):
+    kw_freqs = keyword_index.frequencies(mask)
 
 st.caption(f"Filtered papers: {len(df_f)}")
 
@@ -129,69 +173,90 @@ if debug_mode:
     st.subheader("📊 Diagnostics")
     diagnostics = {
         "total_rows": len(df_f),
-        "rows_with_keywords": df_f["keywords"].apply(len).gt(0).sum(),
-        "unique_keywords": len({k for kws in df_f["keywords"] for k in kws}),
+        "rows_with_keywords": len(df_kw),
+        "unique_keywords": int((kw_freqs > 0).sum()),
         "non_empty_abstracts": (df_f["abstract"].str.len() > 0).sum(),
         "source_type_counts": df_f["source_type"].value_counts().to_dict(),
     }
     st.json(diagnostics)
 
+    st.subheader("⏱️ Stage Timings (this rerun)")
+    # Filled in at the end of the script, once every stage has run.
+    timing_panel = st.empty()
+
 # ======================================================
 # ☁️ WORD CLOUD
 # ======================================================
 st.subheader("☁️ Keyword Word Cloud")
 
-df_wc = filter_nonempty_keywords(df_f)
-fig_wc = plot_wordcloud(df_wc)
+wc_png = render_wordcloud_png(
+    df_kw,
+    max_words=wc_max_words,
+    preview=wc_preview,
+    freqs=keyword_index.top(kw_freqs, limit=wc_max_words)
+)
 
-if fig_wc is None:
+if wc_png is None:
     st.warning(
         "No keywords available for word cloud under current filters.\n\n"
         "Try expanding the year range or including more source types."
     )
 else:
-    st.pyplot(fig_wc)
+    st.image(wc_png, use_container_width=True)
 
 # ======================================================
 # 🧠 KNOWLEDGE GRAPH
 # ======================================================
 st.subheader("🧠 Keyword Co-Occurrence Knowledge Graph")
 
-df_graph = filter_nonempty_keywords(df_f)
-
-if len(df_graph) == 0:
+if len(df_kw) == 0:
     st.warning("No keyword data available to build a co-occurrence graph.")
 else:
-    G = build_cooccurrence_graph(df_graph)
+    G = cooccurrence_graph(fingerprint, filter_key, df_kw)
 
     if G.number_of_nodes() == 0:
         st.warning("Keyword graph is empty after frequency filtering.")
     else:
-        net = build_interactive_graph(G)
-        net.save_graph("kg.html")
-
-        with open("kg.html", "r", encoding="utf-8") as f:
-            st.components.v1.html(f.read(), height=750)
+        kg_html = render_graph_html(
+            G,
+            version=f"{fingerprint}:{filter_key}",
+            max_nodes=kg_max_nodes,
+            method=kg_backbone,
+            collapse=kg_collapse
+        )
+        st.components.v1.html(kg_html, height=750)
 
 # ======================================================
 # ⏳ TEMPORAL ANALYSIS
 # ======================================================
 st.subheader("⏳ Keyword Evolution Over Time")
 
-all_keywords = sorted({
-    k
-    for kws in df_f["keywords"]
-    if isinstance(kws, list)
-    for k in kws
-})
-
-if not all_keywords:
+if not kw_freqs.any():
     st.warning("No keywords available for temporal analysis.")
 else:
-    keyword = st.selectbox("Select keyword", all_keywords)
-    fig_trend = plot_keyword_trend(df_f, keyword)
-    st.pyplot(fig_trend)
+    # Only the top prefix matches are sent to the browser, not the whole vocabulary.
+    prefix = st.text_input("Search keywords", placeholder="Type to filter, e.g. trans")
+
+    with span("complete_keywords"):
+        matches = keyword_index.complete(prefix, limit=50, freqs=kw_freqs)
+
+    if not matches:
+        st.warning(f"No keywords start with '{prefix}' under current filters.")
+    else:
+        keyword = st.selectbox("Select keyword", matches)
+        fig_trend = plot_keyword_trend(df_f, keyword)
+        st.pyplot(fig_trend)
+
+# ======================================================
+# ⏱️ STAGE TIMINGS
+# ======================================================
+if debug_mode:
+    timing_panel.dataframe(
+        pd.DataFrame(current_spans()).sort_values("offset"),
+        use_container_width=True
+    )
 
+write_run()
 
 # import streamlit as st
 # from pathlib import Path
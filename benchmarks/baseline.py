@@ -0,0 +1,121 @@
+"""
+Pre-optimization implementations kept only as benchmark references.
+
+Copied from the baseline pipeline/cleaner.py (and pipeline/dedup.py
+for MinHash) so bench.py can report the gain of the current code against
+what it replaced.
+"""
+
+import numpy as np
+
+
+def parse_keywords(series):
+    def parse(x):
+        if not isinstance(x, str):
+            return []
+        if x.strip() == "":
+            return []
+        return [k.strip().lower() for k in x.split(";") if k.strip()]
+
+    return series.apply(parse)
+
+
+def clean_keywords(df):
+    df = df.copy()
+
+    if "keywords" not in df.columns:
+        df["keywords"] = [[] for _ in range(len(df))]
+        return df
+
+    df["keywords"] = parse_keywords(df["keywords"])
+    return df
+
+
+def normalize_columns(df):
+    rename_map = {
+        "Title": "title",
+        "Abstract": "abstract",
+        "Tags": "keywords",
+        "Journal": "venue",
+        "Year": "year"
+    }
+
+    df = df.rename(columns=rename_map)
+
+    for col in ["keywords", "abstract"]:
+        if col not in df:
+            df[col] = ""
+
+    return df
+
+
+def clean_abstracts(df):
+    df = df.copy()
+    df["abstract"] = (
+        df["abstract"]
+        .fillna("")
+        .replace("(missing abstract)", "")
+        .str.strip()
+    )
+    return df
+
+
+def infer_source_type(df):
+    df = df.copy()
+
+    def classify(venue):
+        if not isinstance(venue, str):
+            return "unknown"
+
+        v = venue.lower()
+
+        conference_keywords = [
+            "conference",
+            "proceedings",
+            "symposium",
+            "workshop",
+            "congress",
+            "ieee",
+            "acm"
+        ]
+
+        if any(k in v for k in conference_keywords):
+            return "conference"
+
+        return "journal"
+
+    df["source_type"] = df["venue"].apply(classify)
+    return df
+
+
+def clean_chain(df):
+    df = normalize_columns(df)
+    df = clean_abstracts(df)
+    df = clean_keywords(df)
+    return infer_source_type(df)
+
+
+def minhash_signatures(hashes, counts, num_perm=64, seed=0):
+    """
+    (n_texts, num_perm) uint32 MinHash signatures using multiply-shift
+    hashing, reduced per text with np.minimum.reduceat.
+    Texts without shingles keep an all-max signature.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    sig = np.full((len(counts), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    nonempty = counts > 0
+    if not nonempty.any():
+        return sig
+
+    offsets = (np.cumsum(counts) - counts)[nonempty]
+    block = max(1, min(num_perm, (1 << 24) // len(hashes)))
+
+    with np.errstate(over="ignore"):
+        for i in range(0, num_perm, block):
+            hv = (hashes[:, None] * a[i:i + block] + b[i:i + block]) >> np.uint64(32)
+            sig[nonempty, i:i + block] = np.minimum.reduceat(hv, offsets, axis=0)
+
+    return sig
@@ -0,0 +1,275 @@
+"""
+Scaling benchmarks for pipeline/ and viz/.
+
+Each stage is run on a seeded synthetic corpus (benchmarks/synthetic.py) and
+its wall time and peak traced memory are appended to a JSONL results file,
+tagged with the current git commit so runs can be compared.
+
+Usage:
+    python -m benchmarks.bench run --sizes 1000 10000 100000 1000000
+    python -m benchmarks.bench run --sizes 200000 --stages keywords_baseline parse_keywords
+    python -m benchmarks.bench run --sizes 200000 --stages minhash_baseline minhash_signatures
+    python -m benchmarks.bench compare <base-commit> <head-commit>
+    python -m benchmarks.bench importtime --fail-on-heavy
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from benchmarks import baseline
+from benchmarks.importtime import run_importtime
+from benchmarks.synthetic import generate_corpus, corpus_csv_file
+from pipeline.loader import load_papers
+from pipeline.cleaner import _parse_keywords, clean_corpus
+from pipeline.cooccurrence import build_cooccurrence_graph
+from pipeline.dedup import (
+    _shingle_hashes,
+    minhash_signatures,
+    near_duplicate_clusters,
+    normalize_titles,
+)
+from pipeline.keyword_extractor import generate_fallback_keywords
+from viz import wordclouds
+from viz.timeline import plot_keyword_trend
+
+RESULTS_PATH = Path(__file__).parent / "results.jsonl"
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parents[1],
+            text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def measure(fn, *args, trace_memory=True, **kwargs):
+    """Return (result, seconds, peak_mb)."""
+    if trace_memory:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    seconds = time.perf_counter() - start
+
+    peak_mb = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = peak / 2**20
+
+    return result, seconds, peak_mb
+
+
+def _wordcloud(df):
+    wordclouds._PNG_CACHE.clear()
+    fig = wordclouds.plot_wordcloud(df)
+    if fig is not None:
+        plt.close(fig)
+
+
+def _trend(df):
+    exploded = df["keywords"].explode().dropna()
+    if exploded.empty:
+        return
+    plt.close(plot_keyword_trend(df, exploded.value_counts().index[0]))
+
+
+STAGES = [
+    "load_papers",
+    "baseline_cleaners",
+    "clean_corpus",
+    "keywords_baseline",
+    "parse_keywords",
+    "minhash_baseline",
+    "minhash_signatures",
+    "near_duplicate_clusters",
+    "generate_fallback_keywords",
+    "build_cooccurrence_graph",
+    "plot_wordcloud",
+    "plot_keyword_trend",
+]
+
+
+def run_sizes(sizes, seed=42, trace_memory=True, fallback_max_rows=100_000, only=None):
+    """
+    Yield one result record per (size, stage). `only` restricts the stages
+    recorded; loading and clean_corpus still run since later stages need them.
+    """
+    only = set(only or STAGES)
+
+    for n in sizes:
+        corpus = generate_corpus(n, seed=seed)
+        upload = corpus_csv_file(corpus)
+        del corpus
+
+        stages = []
+
+        def run(stage, fn, arg, rows):
+            if stage in only:
+                result, *timing = measure(fn, arg, trace_memory=trace_memory)
+                stages.append((stage, rows, timing))
+                return result
+            return None
+
+        raw, *timing = measure(load_papers, upload, trace_memory=trace_memory)
+        stages.append(("load_papers", len(raw), timing))
+
+        # "*_baseline" stages run the pre-optimization code (benchmarks/baseline.py).
+        run("baseline_cleaners", baseline.clean_chain, raw, len(raw))
+        keywords = raw["Tags"] if "Tags" in raw else raw["keywords"]
+        run("keywords_baseline", baseline.parse_keywords, keywords, len(raw))
+        run("parse_keywords", _parse_keywords, keywords, len(raw))
+
+        df, *timing = measure(clean_corpus, raw, trace_memory=trace_memory)
+        stages.append(("clean_corpus", len(df), timing))
+        del raw
+
+        if only & {"minhash_baseline", "minhash_signatures"}:
+            shingles = _shingle_hashes(normalize_titles(df["title"]).tolist())
+            run("minhash_baseline", lambda s: baseline.minhash_signatures(*s), shingles, len(df))
+            run("minhash_signatures", lambda s: minhash_signatures(*s), shingles, len(df))
+            del shingles
+        run("near_duplicate_clusters", near_duplicate_clusters, df["title"], len(df))
+
+        sample = df.head(fallback_max_rows)
+        run("generate_fallback_keywords", generate_fallback_keywords, sample, len(sample))
+
+        df_kw = df[df["keywords"].apply(len) > 0]
+        run("build_cooccurrence_graph", build_cooccurrence_graph, df_kw, len(df_kw))
+        run("plot_wordcloud", _wordcloud, df_kw, len(df_kw))
+        run("plot_keyword_trend", _trend, df, len(df))
+
+        stages = [s for s in stages if s[0] in only]
+
+        for stage, rows, (seconds, peak_mb) in stages:
+            yield {
+                "n_papers": n,
+                "stage": stage,
+                "rows": rows,
+                "seconds": round(seconds, 6),
+                "peak_mb": None if peak_mb is None else round(peak_mb, 3),
+            }
+
+
+def cmd_run(args):
+    commit = git_commit()
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    out = Path(args.results)
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(out, "a", encoding="utf-8") as f:
+        for record in run_sizes(
+            args.sizes,
+            seed=args.seed,
+            trace_memory=not args.no_memory,
+            fallback_max_rows=args.fallback_max_rows,
+            only=args.stages,
+        ):
+            record = {"commit": commit, "timestamp": timestamp, **record}
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            print(
+                f"{record['n_papers']:>9,}  {record['stage']:<28}"
+                f"{record['seconds']:>10.3f}s  {record['peak_mb']} MB"
+            )
+
+
+def cmd_importtime(args):
+    commit = git_commit()
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    out = Path(args.results)
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    offenders = []
+    with open(out, "a", encoding="utf-8") as f:
+        for record in run_importtime():
+            record = {"commit": commit, "timestamp": timestamp, **record}
+            f.write(json.dumps(record) + "\n")
+            heavy = ", ".join(record["heavy"])
+            print(f"{record['stage']:<36}{record['seconds']:>10.3f}s  {heavy}")
+            if record["heavy"]:
+                offenders.append(record["stage"])
+
+    if offenders and args.fail_on_heavy:
+        sys.exit(1)
+
+
+def load_results(path, commit):
+    """Latest record per (n_papers, stage) for a commit."""
+    latest = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            r = json.loads(line)
+            if r["commit"] == commit:
+                latest[(r["n_papers"], r["stage"])] = r
+    return latest
+
+
+def cmd_compare(args):
+    base = load_results(args.results, args.base)
+    head = load_results(args.results, args.head)
+
+    regressions = defaultdict(list)
+    for key in sorted(base.keys() & head.keys()):
+        b, h = base[key], head[key]
+        ratio = h["seconds"] / b["seconds"] if b["seconds"] else float("inf")
+        flag = "⚠️" if ratio > args.threshold else ""
+        print(f"{key[0]:>9,}  {key[1]:<28}{b['seconds']:>10.3f}s -> {h['seconds']:>10.3f}s  x{ratio:.2f} {flag}")
+        if flag:
+            regressions[key[1]].append(key[0])
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="pipeline/ and viz/ scaling benchmarks")
+    parser.add_argument("--results", default=str(RESULTS_PATH), help="JSONL results file")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="benchmark every stage for each corpus size")
+    run.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--no-memory", action="store_true", help="skip tracemalloc (faster, no peak_mb)")
+    run.add_argument("--fallback-max-rows", type=int, default=100_000)
+    run.add_argument("--stages", nargs="+", choices=STAGES, default=None,
+                     help="record only these stages")
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare", help="compare two commits' latest results")
+    compare.add_argument("base")
+    compare.add_argument("head")
+    compare.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio flagged as a regression")
+    compare.add_argument("--fail-on-regression", action="store_true")
+    compare.set_defaults(func=cmd_compare)
+
+    importtime = sub.add_parser("importtime", help="python -X importtime per pipeline/viz module")
+    importtime.add_argument("--fail-on-heavy", action="store_true",
+                            help="exit 1 if a heavy dependency is imported at module import time")
+    importtime.set_defaults(func=cmd_importtime)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Import-time regression checks based on `python -X importtime`.
+
+Each module is imported in a fresh interpreter; the cumulative import time
+is recorded, and the run fails if a heavy optional dependency is pulled in
+at import time by pipeline/ or viz/. Modules that `import pandas` itself
+brings in (pandas 2.x imports pyarrow when it is installed) are not
+counted against our code.
+"""
+
+import re
+import subprocess
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1]
+
+MODULES = [
+    "pipeline.loader",
+    "pipeline.cleaner",
+    "pipeline.venues",
+    "pipeline.filter_index",
+    "pipeline.corpus",
+    "pipeline.keyword_extractor",
+    "pipeline.cooccurrence",
+    "pipeline.timing",
+    "pipeline.keyword_index",
+    "pipeline.dedup",
+    "pipeline.exports",
+    "pipeline.schema",
+    "pipeline.registry_store",
+    "pipeline.registry",
+    "pipeline.linker",
+    "viz.wordclouds",
+    "viz.network",
+    "viz.timeline",
+    "viz.lru",
+    "viz.paged_table",
+    "viz.downloads",
+    "viz.mapping_graph",
+    "viz.sankey",
+]
+
+# Must only be imported by the code path that uses them.
+HEAVY_MODULES = ["sklearn", "wordcloud", "pyvis", "networkx", "matplotlib", "pyarrow"]
+
+# Imported by everything here; whatever it pulls in is not ours to flag.
+BASELINE_STATEMENT = "import pandas"
+
+_LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+
+def import_profile(statement, top_level=False):
+    """
+    Return {module: cumulative_us} for `python -X importtime -c statement`.
+    With top_level=True only the outermost imports are kept; their
+    cumulative times add up to the statement's total import time.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m and (not top_level or len(m.group(3)) == 1):
+            profile[m.group(4)] = int(m.group(2))
+    return profile
+
+
+@lru_cache(maxsize=1)
+def baseline_modules():
+    """Modules already loaded by BASELINE_STATEMENT."""
+    return frozenset(import_profile(BASELINE_STATEMENT))
+
+
+def heavy_imports(profile):
+    """Heavy modules in `profile` beyond those the baseline imports."""
+    baseline = baseline_modules()
+    return sorted(h for h in HEAVY_MODULES if h in profile and h not in baseline)
+
+
+def check_module(module):
+    """Import time (s) of `module` and the heavy modules it drags in."""
+    profile = import_profile(f"import {module}")
+    heavy = heavy_imports(profile)
+    return profile.get(module, 0) / 1e6, heavy
+
+
+def run_importtime(modules=MODULES):
+    """Yield one record per module, plus one for importing them all together."""
+    for module in modules:
+        seconds, heavy = check_module(module)
+        yield {"n_papers": 0, "stage": f"import:{module}", "seconds": round(seconds, 6),
+               "peak_mb": None, "heavy": heavy}
+
+    statement = "; ".join(f"import {m}" for m in modules)
+    total = sum(import_profile(statement, top_level=True).values())
+    profile = import_profile(statement)
+    yield {
+        "n_papers": 0,
+        "stage": "import:all",
+        "seconds": round(total / 1e6, 6),
+        "peak_mb": None,
+        "heavy": heavy_imports(profile),
+    }
@@ -0,0 +1,110 @@
+"""
+Seeded synthetic corpus generator mimicking a Litmaps CSV export.
+
+Keywords, venues and abstract words follow Zipf-like distributions so
+co-occurrence graphs and word clouds have a realistic long tail.
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+
+LITMAPS_COLUMNS = [
+    "DOI", "Title", "Authors", "Journal", "Year", "Abstract",
+    "LitmapsId", "Cited By", "References", "PubMedId", "Tags",
+]
+
+CONFERENCE_VENUES = [
+    "Annual Meeting of the Association for Computational Linguistics",
+    "Conference on Empirical Methods in Natural Language Processing",
+    "Proceedings of the AAAI Conference on Artificial Intelligence",
+    "International Conference on Learning Representations",
+    "IEEE International Conference on Big Data",
+    "ACM Conference on Fairness, Accountability, and Transparency",
+    "Workshop on Economics and Natural Language Processing",
+]
+
+JOURNAL_VENUES = [
+    "Transactions of the Association for Computational Linguistics",
+    "Computational Linguistics",
+    "Journal of Business Ethics",
+    "Sustainability",
+    "Finance Research Letters",
+    "Expert Systems with Applications",
+    "arXiv.org",
+    "(missing journal)",
+]
+
+
+def _zipf_choice(rng, n_items, size, a=1.2):
+    ranks = np.arange(1, n_items + 1)
+    p = ranks ** -a
+    return rng.choice(n_items, size=size, p=p / p.sum())
+
+
+def _vocabulary(rng, size, prefix):
+    syllables = np.array(["ra", "ko", "mi", "esg", "lin", "ta", "vo", "ne", "qu", "da"])
+    parts = rng.choice(syllables, size=(size, 3))
+    return [f"{prefix}{''.join(p)}{i}" for i, p in enumerate(parts)]
+
+
+def _random_texts(rng, vocab, n_rows, n_words, block=50_000):
+    """Zipf-distributed word strings, built in blocks to bound memory."""
+    texts = []
+    for start in range(0, n_rows, block):
+        rows = min(block, n_rows - start)
+        idx = _zipf_choice(rng, len(vocab), (rows, n_words), a=1.0)
+        texts.extend(" ".join(vocab[j] for j in row) for row in idx.tolist())
+    return texts
+
+
+def generate_corpus(
+    n_papers,
+    seed=42,
+    vocab_size=5000,
+    mean_keywords=4,
+    empty_keyword_rate=0.3,
+    title_words=10,
+    abstract_words=60,
+):
+    """Return a DataFrame with the Litmaps column layout."""
+    rng = np.random.default_rng(seed)
+
+    keyword_vocab = _vocabulary(rng, vocab_size, "kw ")
+    word_vocab = _vocabulary(rng, vocab_size, "")
+    venues = np.array(CONFERENCE_VENUES + JOURNAL_VENUES)
+
+    n_kw = rng.poisson(mean_keywords, size=n_papers)
+    n_kw[rng.random(n_papers) < empty_keyword_rate] = 0
+    kws = [keyword_vocab[i] for i in _zipf_choice(rng, vocab_size, n_kw.sum()).tolist()]
+    offsets = np.concatenate([[0], np.cumsum(n_kw)]).tolist()
+    tags = ["; ".join(kws[a:b]) for a, b in zip(offsets[:-1], offsets[1:])]
+
+    titles = _random_texts(rng, word_vocab, n_papers, title_words)
+    abstracts = _random_texts(rng, word_vocab, n_papers, abstract_words)
+    missing = rng.random(n_papers) < 0.1
+    abstracts = [
+        "(missing abstract)" if m else a for m, a in zip(missing, abstracts)
+    ]
+
+    return pd.DataFrame({
+        "DOI": [f"10.0000/synthetic.{seed}.{i}" for i in range(n_papers)],
+        "Title": titles,
+        "Authors": "Jane Doe, John Roe",
+        "Journal": venues[_zipf_choice(rng, len(venues), n_papers, a=0.8)],
+        "Year": rng.integers(2000, 2026, size=n_papers),
+        "Abstract": abstracts,
+        "LitmapsId": rng.integers(10**6, 10**8, size=n_papers),
+        "Cited By": rng.poisson(10, size=n_papers),
+        "References": rng.poisson(30, size=n_papers),
+        "PubMedId": np.nan,
+        "Tags": tags,
+    })[LITMAPS_COLUMNS]
+
+
+def corpus_csv_file(df, name="synthetic.csv"):
+    """In-memory CSV upload with a .name, as load_papers expects."""
+    buf = io.BytesIO(df.to_csv(index=False).encode("utf-8"))
+    buf.name = name
+    return buf
@@ -0,0 +1,126 @@
+"""
+Headless landscape pipeline.
+
+Runs the same pipeline/ and viz/ chain as app.py over one or many paper
+files, in parallel processes, and writes per-input artefacts:
+
+    <out>/<stem>[/<year>]/graph.graphml
+    <out>/<stem>[/<year>]/graph.json
+    <out>/<stem>[/<year>]/wordcloud.png
+    <out>/<stem>[/<year>]/keyword_trends.csv
+    <out>/<stem>[/<year>]/summary.json
+
+Usage:
+    python cli.py data/litmap/*.csv --out landscapes --workers 8
+    python cli.py data/litmap/litmap_acl_2025.csv --by-year
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from pipeline.corpus import prepare_corpus
+from pipeline.cooccurrence import build_cooccurrence_graph
+from pipeline.venues import build_venue_type_map
+from viz.network import reduce_graph
+from viz.timeline import keyword_trend_table
+from viz.wordclouds import render_wordcloud_png
+
+
+def write_landscape(df, out_dir, min_freq=5, max_words=200, reduce=True):
+    """Write graph, word cloud and trend table for one (slice of a) corpus."""
+    import networkx as nx
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    df_kw = df[df["keywords"].apply(len) > 0]
+
+    G = build_cooccurrence_graph(df_kw, min_freq=min_freq)
+    if reduce and G.number_of_nodes() > 0:
+        G = reduce_graph(G)
+
+    nx.write_graphml(G, out_dir / "graph.graphml")
+    with open(out_dir / "graph.json", "w", encoding="utf-8") as f:
+        json.dump(nx.node_link_data(G), f, ensure_ascii=False)
+
+    png = render_wordcloud_png(df_kw, max_words=max_words)
+    if png is not None:
+        (out_dir / "wordcloud.png").write_bytes(png)
+
+    keyword_trend_table(df_kw).to_csv(out_dir / "keyword_trends.csv")
+
+    summary = {
+        "papers": len(df),
+        "papers_with_keywords": len(df_kw),
+        "graph_nodes": G.number_of_nodes(),
+        "graph_edges": G.number_of_edges(),
+    }
+    with open(out_dir / "summary.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    return summary
+
+
+def load_file(path):
+    with open(path, "rb") as f:
+        df, _ = prepare_corpus(f, venue_types=build_venue_type_map())
+    return df
+
+
+def run_file(path, out_root, **kwargs):
+    df = load_file(path)
+    return str(path), write_landscape(df, Path(out_root) / Path(path).stem, **kwargs)
+
+
+def run_file_by_year(path, out_root, **kwargs):
+    """
+    Whole-file and per-year landscapes of one input, loaded and cleaned in
+    the worker so only the small summaries travel back to the parent.
+    """
+    df = load_file(path)
+    stem_dir = Path(out_root) / Path(path).stem
+
+    results = [(str(path), write_landscape(df, stem_dir, **kwargs))]
+    for year, df_year in df.groupby("year"):
+        results.append((
+            f"{path} [{int(year)}]",
+            write_landscape(df_year, stem_dir / str(int(year)), **kwargs),
+        ))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("inputs", nargs="+", help="CSV / JSON / JSONL / Parquet / Feather files")
+    parser.add_argument("--out", default="landscapes", help="output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--by-year", action="store_true", help="also write one landscape per year")
+    parser.add_argument("--min-freq", type=int, default=5, help="min keyword pair co-occurrence")
+    parser.add_argument("--max-words", type=int, default=200, help="word cloud size cap")
+    parser.add_argument("--no-reduce", action="store_true", help="keep the full co-occurrence graph")
+    args = parser.parse_args(argv)
+
+    opts = {
+        "min_freq": args.min_freq,
+        "max_words": args.max_words,
+        "reduce": not args.no_reduce,
+    }
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        task = run_file_by_year if args.by_year else run_file
+        futures = [
+            pool.submit(task, path, args.out, **opts)
+            for path in args.inputs
+        ]
+
+        for fut in as_completed(futures):
+            result = fut.result()
+            for label, summary in result if args.by_year else [result]:
+                print(f"✅ {label}: {summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 import streamlit as st
 import plotly.graph_objects as go
 
+from pipeline.registry import load_registry, registry_path
+from viz.sankey import MAX_PAPERS, MAX_RQS, registry_sankey
+
 # ============================================================
 # PAGE CONFIG
 # ============================================================
@@ -9,7 +12,7 @@ st.set_page_config(
     layout="wide"
 )
 
-st.title("🔗 Research Mapping: Themes → Research Questions → Projects")
+st.title("🔗 Research Mapping: Themes → Research Questions → Methods → Papers")
 st.caption(
     "Visualizing how high-level ESG research themes are operationalized "
     "into research questions and instantiated as concrete research projects"
@@ -25,12 +28,11 @@ with st.expander("📘 How to Read This Diagram", expanded=True):
         """
         **This Sankey diagram represents the intellectual flow of the research project:**
 
-        - **Left:** High-level *research themes* motivating the work  
-        - **Middle:** Concrete *research questions (RQs)* derived from those themes  
-        - **Right:** Implemented *research projects / papers*
+        - **Left:** High-level *research themes* (the RQ code, e.g. PRQ / MRQ)  
+        - **Middle:** Concrete *research questions (RQs)* and the *method category* of their papers  
+        - **Right:** The *papers* mapped in the registry
 
-        **Flow thickness** represents conceptual relevance and strength of linkage,  
-        not statistical weight.
+        **Flow thickness** is the number of RQ ↔ paper mappings in `registry.json`.
 
         This structure demonstrates:
         - Conceptual coherence  
@@ -40,101 +42,28 @@ with st.expander("📘 How to Read This Diagram", expanded=True):
     )
 
 # ============================================================
-# SANKEY DATA
+# SANKEY DATA (derived from the registry, cached per version)
 # ============================================================
-labels = [
-    # Themes
-    "Greenwashing & Deceptive Rhetoric",
-    "Transparency & Rating Consistency",
-    "Technological Innovations in ESG-NLP",
-    "Financial Predictability & Risk",
-
-    # Research Questions
-    "Multimodal Greenwashing Detection",
-    "Carbonwashing Index",
-    "Tone & Linguistic Disambiguity",
-    "Rating Inconsistency",
-    "Explainable ESG (KG / Neurosymbolic)",
-    "SME ESG Feasibility",
-    "Real-Time ESG Intelligence",
-    "ESG Sentiment & Risk",
-
-    # Research Projects
-    "Paper 1: Carbonwashing Triangulation",
-    "Paper 2: Neurosymbolic ESG Scoring",
-    "Paper 3: SME Credit Risk (Causal ESG)",
-    "Paper 4: KG-RAG Real-Time ESG"
-]
-
-source = [
-    # Themes → RQs
-    0, 0, 0,            # Greenwashing
-    1, 1,               # Transparency
-    2, 2, 2,            # Tech
-    3, 3,               # Finance
-
-    # RQs → Papers
-    4, 5, 6,            # → Paper 1
-    7, 8,               # → Paper 2
-    9, 10,              # → Paper 3
-    11                  # → Paper 4
-]
-
-target = [
-    # Themes → RQs
-    4, 5, 6,
-    7, 8,
-    8, 9, 11,
-    10, 11,
-
-    # RQs → Papers
-    12, 12, 12,
-    13, 13,
-    14, 14,
-    15
-]
-
-value = [
-    # Themes → RQs
-    3, 2, 3,
-    3, 3,
-    2, 2, 3,
-    2, 3,
-
-    # RQs → Papers
-    3, 2, 3,
-    3, 3,
-    3, 2,
-    4
-]
+DATA_PATH = registry_path()
+
+if not DATA_PATH.exists():
+    st.error(f"registry.json not found at: {DATA_PATH}")
+    st.stop()
+
+reg = load_registry(DATA_PATH)
+
+c1, c2 = st.columns(2)
+max_rqs = c1.slider("Research question nodes", 5, 50, MAX_RQS, step=1)
+max_papers = c2.slider("Paper nodes", 10, 200, MAX_PAPERS, step=10)
+st.caption(
+    f"{len(reg.papers)} mappings from {len(reg.tracks)} research tracks. "
+    "Smaller flows beyond the node budgets are bundled into \"Other\" nodes."
+)
 
 # ============================================================
 # SANKEY FIGURE
 # ============================================================
-fig = go.Figure(
-    data=[
-        go.Sankey(
-            arrangement="snap",
-            node=dict(
-                label=labels,
-                pad=18,
-                thickness=22,
-                line=dict(color="black", width=0.5)
-            ),
-            link=dict(
-                source=source,
-                target=target,
-                value=value
-            )
-        )
-    ]
-)
-
-fig.update_layout(
-    title="Sankey Diagram: ESG Research Logic Flow",
-    font_size=12,
-    height=700
-)
+fig = go.Figure(registry_sankey(reg, max_rqs=max_rqs, max_papers=max_papers))
 
 st.plotly_chart(fig, use_container_width=True)
 
@@ -194,3 +123,102 @@ with st.expander("⬇️ Export / Reuse"):
           - LaTeX/TikZ recreation
         """
     )
+
+
+# Former hand-written diagram data:
+# # ============================================================
+# # SANKEY DATA
+# # ============================================================
+# labels = [
+#     # Themes
+#     "Greenwashing & Deceptive Rhetoric",
+#     "Transparency & Rating Consistency",
+#     "Technological Innovations in ESG-NLP",
+#     "Financial Predictability & Risk",
+#
+#     # Research Questions
+#     "Multimodal Greenwashing Detection",
+#     "Carbonwashing Index",
+#     "Tone & Linguistic Disambiguity",
+#     "Rating Inconsistency",
+#     "Explainable ESG (KG / Neurosymbolic)",
+#     "SME ESG Feasibility",
+#     "Real-Time ESG Intelligence",
+#     "ESG Sentiment & Risk",
+#
+#     # Research Projects
+#     "Paper 1: Carbonwashing Triangulation",
+#     "Paper 2: Neurosymbolic ESG Scoring",
+#     "Paper 3: SME Credit Risk (Causal ESG)",
+#     "Paper 4: KG-RAG Real-Time ESG"
+# ]
+#
+# source = [
+#     # Themes → RQs
+#     0, 0, 0,            # Greenwashing
+#     1, 1,               # Transparency
+#     2, 2, 2,            # Tech
+#     3, 3,               # Finance
+#
+#     # RQs → Papers
+#     4, 5, 6,            # → Paper 1
+#     7, 8,               # → Paper 2
+#     9, 10,              # → Paper 3
+#     11                  # → Paper 4
+# ]
+#
+# target = [
+#     # Themes → RQs
+#     4, 5, 6,
+#     7, 8,
+#     8, 9, 11,
+#     10, 11,
+#
+#     # RQs → Papers
+#     12, 12, 12,
+#     13, 13,
+#     14, 14,
+#     15
+# ]
+#
+# value = [
+#     # Themes → RQs
+#     3, 2, 3,
+#     3, 3,
+#     2, 2, 3,
+#     2, 3,
+#
+#     # RQs → Papers
+#     3, 2, 3,
+#     3, 3,
+#     3, 2,
+#     4
+# ]
+#
+# # ============================================================
+# # SANKEY FIGURE
+# # ============================================================
+# fig = go.Figure(
+#     data=[
+#         go.Sankey(
+#             arrangement="snap",
+#             node=dict(
+#                 label=labels,
+#                 pad=18,
+#                 thickness=22,
+#                 line=dict(color="black", width=0.5)
+#             ),
+#             link=dict(
+#                 source=source,
+#                 target=target,
+#                 value=value
+#             )
+#         )
+#     ]
+# )
+#
+# fig.update_layout(
+#     title="Sankey Diagram: ESG Research Logic Flow",
+#     font_size=12,
+#     height=700
+# )
@@ -15,16 +15,14 @@
 # --------------------------------------------------
 
 import json
-from pathlib import Path
-import pandas as pd
 import streamlit as st
 
-# ================================
-# CONFIG
-# ================================
-
-BASE_DIR = Path(__file__).parents[1]
-DATA_PATH = BASE_DIR / "data" / "registry.json"
+from pipeline.exports import write_json
+from pipeline.registry import REGISTRY_PATH, load_registry, registry_path
+from pipeline.registry_store import MANIFEST, STORE_DIR, import_registry, ingest
+from pipeline.schema import SchemaError
+from viz.downloads import lazy_download
+from viz.paged_table import paged_table
 
 st.set_page_config(page_title="ESG Neuro-Symbolic Literature", layout="wide")
 st.title("📚 ESG Neuro-Symbolic Literature Explorer")
@@ -33,14 +31,15 @@ st.title("📚 ESG Neuro-Symbolic Literature Explorer")
 # LOAD DATA
 # ================================
 
+DATA_PATH = registry_path()
+
 if not DATA_PATH.exists():
     st.error(f"registry.json not found at: {DATA_PATH}")
     st.stop()
 
-with open(DATA_PATH, "r", encoding="utf-8") as f:
-    registry = json.load(f)
-
-tracks = registry.get("research_tracks", [])
+reg = load_registry(DATA_PATH)
+registry = reg.raw
+tracks = reg.tracks
 
 if not tracks:
     st.error("No research_tracks found in registry.json")
@@ -52,11 +51,15 @@ if not tracks:
 
 st.sidebar.header("🧠 Research Questions")
 
-rq_labels = [t["meta"]["research_question"] for t in tracks]
+rq_labels = [
+    t.get("meta", {}).get("research_question") or f"RQ_{i}"
+    for i, t in enumerate(tracks)
+]
 
 selected_rq = st.sidebar.selectbox("Select Research Question", rq_labels)
 
-track = next(t for t in tracks if t["meta"]["research_question"] == selected_rq)
+track_idx = rq_labels.index(selected_rq)
+track = tracks[track_idx]
 meta = track.get("meta", {})
 papers = track.get("papers", [])
 
@@ -72,28 +75,12 @@ if meta.get("notes"):
     st.caption(meta.get("notes"))
 
 # ================================
-# FLATTEN FOR TABLE
+# TABLE ROWS (flattened once in pipeline.registry)
 # ================================
 
-rows = []
-for p in papers:
-    links = p.get("external_links", [])
-
-    doi = next((l["url"] for l in links if l.get("type") == "doi"), "")
-    pdf = next((l["url"] for l in links if l.get("type") == "pdf"), "")
-
-    rows.append({
-        "id": p.get("id"),
-        "title": p.get("input", {}).get("title"),
-        "method": p.get("method_category"),
-        "trace": p.get("decision_trace_support"),
-        "relevance": p.get("relevance_score"),
-        "regulatory": ", ".join(p.get("regulatory_relevance", [])),
-        "doi": doi,
-        "pdf": pdf,
-    })
-
-df = pd.DataFrame(rows)
+df = reg.track_papers(track_idx).rename(columns={"paper_id": "id"})[
+    ["id", "title", "method", "trace", "relevance", "regulatory", "doi", "pdf"]
+]
 
 if df.empty:
     st.warning("No papers found for this research question.")
@@ -105,19 +92,53 @@ if df.empty:
 
 st.sidebar.header("🔍 Filters")
 
+# Facet counts are slices of the registry's count cube. session_state
+# already holds this run's selections, so every option count reflects the
+# other filters as they are now.
+cube = reg.cube
+facets = {
+    "rq": [selected_rq],
+    "method": st.session_state.get("explorer_method"),
+    "trace": st.session_state.get("explorer_trace"),
+}
+facet_min_relevance = st.session_state.get("explorer_min_relevance", 0.7)
+
+
+def facet_label(dim):
+    counts = cube.facet_counts(dim, min_relevance=facet_min_relevance, **facets)
+    return lambda v: f"{v} ({counts.get(v, 0)})"
+
+
 method_filter = st.sidebar.multiselect(
     "Method Category",
     sorted(df["method"].dropna().unique().tolist()),
     default=sorted(df["method"].dropna().unique().tolist()),
+    key="explorer_method",
+    format_func=facet_label("method"),
 )
 
 trace_filter = st.sidebar.multiselect(
     "Decision Trace Support",
     sorted(df["trace"].dropna().unique().tolist()),
     default=sorted(df["trace"].dropna().unique().tolist()),
+    key="explorer_trace",
+    format_func=facet_label("trace"),
 )
 
-min_relevance = st.sidebar.slider("Minimum relevance", 0.0, 1.0, 0.7, 0.01)
+min_relevance = st.sidebar.slider(
+    "Minimum relevance", 0.0, 1.0, 0.7, 0.01, key="explorer_min_relevance"
+)
+
+n_matching, max_matching = cube.summary(
+    min_relevance=min_relevance,
+    rq=[selected_rq],
+    method=method_filter,
+    trace=trace_filter,
+)
+st.sidebar.caption(
+    f"{n_matching} mappings match"
+    + (f" · max relevance {max_matching:.2f}" if n_matching else "")
+)
 
 search = st.sidebar.text_input("Search title")
 
@@ -136,9 +157,12 @@ if search:
 
 st.subheader("📄 Paper Overview")
 
-st.dataframe(
-    filtered.sort_values("relevance", ascending=False),
-    use_container_width=True,
+paged_table(
+    filtered,
+    key="explorer_table",
+    sort_by="relevance",
+    ascending=False,
+    version=(reg.version, track_idx, tuple(method_filter), tuple(trace_filter), min_relevance, search),
 )
 
 # ================================
@@ -192,15 +216,47 @@ st.markdown("**Suggested Citations**")
 for c in selected.get("suggested_citations", []):
     st.markdown(f"- [{c['title']}]({c['link']}) — {c['reason']}")
 
+# ================================
+# APPEND NOTEBOOKLM RESULT
+# ================================
+
+with st.sidebar.expander("➕ Add NotebookLM result"):
+    result_file = st.file_uploader(
+        "NotebookLM JSON ({meta, papers})",
+        type=["json"],
+        key="registry_ingest",
+    )
+
+    if result_file is not None and st.button("Append to registry"):
+        # First append: seed the segmented store from registry.json.
+        if not (STORE_DIR / MANIFEST).exists():
+            import_registry(REGISTRY_PATH)
+
+        try:
+            ingest(json.load(result_file))
+        except json.JSONDecodeError as e:
+            st.error(f"Not valid JSON: {e}")
+        except SchemaError as e:
+            st.error(f"{len(e.errors)} schema error(s), nothing appended:")
+            st.dataframe(
+                [{"path": path, "error": message} for path, message in e.errors],
+                use_container_width=True,
+            )
+        else:
+            st.rerun()
+
 # ================================
 # EXPORT
 # ================================
 
-st.download_button(
-    "⬇️ Download registry.json",
-    data=json.dumps(registry, indent=2),
+lazy_download(
+    "registry.json",
+    "registry",
+    reg.version,
+    write_json(registry),
     file_name="registry.json",
     mime="application/json",
+    key="explorer_export",
 )
 
 
@@ -3,21 +3,15 @@
 # Global RQ ↔ Paper Mapping Graph
 # --------------------------------------------------
 
-import json
-from pathlib import Path
-import pandas as pd
 import streamlit as st
 
-from pyvis.network import Network
 import streamlit.components.v1 as components
-import tempfile
 
-# ================================
-# CONFIG
-# ================================
-
-BASE_DIR = Path(__file__).parents[1]   # 👈 as you requested
-DATA_PATH = BASE_DIR / "data" / "registry.json"
+from pipeline.exports import write_json
+from pipeline.registry import load_registry, registry_path
+from viz.mapping_graph import MAX_PAPER_NODES, render_mapping_graph_html
+from viz.downloads import lazy_download
+from viz.paged_table import paged_table
 
 st.set_page_config(page_title="ESG Literature Map", layout="wide")
 st.title("📚 ESG Research Landscape — RQ ↔ Paper Mapping")
@@ -26,14 +20,15 @@ st.title("📚 ESG Research Landscape — RQ ↔ Paper Mapping")
 # LOAD DATA
 # ================================
 
+DATA_PATH = registry_path()
+
 if not DATA_PATH.exists():
     st.error(f"registry.json not found at: {DATA_PATH}")
     st.stop()
 
-with open(DATA_PATH, "r", encoding="utf-8") as f:
-    registry = json.load(f)
-
-tracks = registry.get("research_tracks", [])
+reg = load_registry(DATA_PATH)
+registry = reg.raw
+tracks = reg.tracks
 
 if not tracks:
     st.error("No research_tracks found in registry.json")
@@ -43,31 +38,9 @@ if not tracks:
 # BUILD GLOBAL TABLE
 # ================================
 
-rows = []
-paper_lookup = {}
+paper_lookup = reg.paper_lookup
 
-for ti, t in enumerate(tracks):
-    rq_id = f"RQ_{ti}"
-    rq_text = t["meta"]["research_question"]
-
-    for p in t.get("papers", []):
-        pid = p.get("id")
-        title = p.get("input", {}).get("title")
-
-        rows.append({
-            "rq_id": rq_id,
-            "rq": rq_text,
-            "paper_id": pid,
-            "title": title,
-            "method": p.get("method_category"),
-            "trace": p.get("decision_trace_support"),
-            "relevance": p.get("relevance_score"),
-            "regulatory": ", ".join(p.get("regulatory_relevance", [])),
-        })
-
-        paper_lookup[pid] = p
-
-df = pd.DataFrame(rows)
+df = reg.papers[["rq_id", "rq", "paper_id", "title", "method", "trace", "relevance", "regulatory"]]
 
 if df.empty:
     st.warning("No paper mappings found.")
@@ -79,28 +52,69 @@ if df.empty:
 
 st.sidebar.header("🔍 Global Filters")
 
+# Facet counts are slices of the registry's count cube. session_state
+# already holds this run's selections, so every option count reflects the
+# other filters as they are now.
+cube = reg.cube
+facets = {
+    "rq": st.session_state.get("rqgraph_rq"),
+    "method": st.session_state.get("rqgraph_method"),
+    "trace": st.session_state.get("rqgraph_trace"),
+}
+facet_min_relevance = st.session_state.get("rqgraph_min_relevance", 0.7)
+
+
+def facet_label(dim):
+    counts = cube.facet_counts(dim, min_relevance=facet_min_relevance, **facets)
+    return lambda v: f"{v} ({counts.get(v, 0)})"
+
+
 rq_filter = st.sidebar.multiselect(
     "Research Questions",
-    sorted(df["rq"].unique().tolist()),
-    default=sorted(df["rq"].unique().tolist()),
+    cube.values["rq"],
+    default=cube.values["rq"],
+    key="rqgraph_rq",
+    format_func=facet_label("rq"),
 )
 
 method_filter = st.sidebar.multiselect(
     "Method Category",
-    sorted(df["method"].dropna().unique().tolist()),
-    default=sorted(df["method"].dropna().unique().tolist()),
+    cube.values["method"],
+    default=cube.values["method"],
+    key="rqgraph_method",
+    format_func=facet_label("method"),
 )
 
 trace_filter = st.sidebar.multiselect(
     "Decision Trace Support",
-    sorted(df["trace"].dropna().unique().tolist()),
-    default=sorted(df["trace"].dropna().unique().tolist()),
+    cube.values["trace"],
+    default=cube.values["trace"],
+    key="rqgraph_trace",
+    format_func=facet_label("trace"),
+)
+
+min_relevance = st.sidebar.slider(
+    "Minimum relevance", 0.0, 1.0, 0.7, 0.01, key="rqgraph_min_relevance"
 )
 
-min_relevance = st.sidebar.slider("Minimum relevance", 0.0, 1.0, 0.7, 0.01)
+n_matching, max_matching = cube.summary(
+    min_relevance=min_relevance,
+    rq=rq_filter,
+    method=method_filter,
+    trace=trace_filter,
+)
+st.sidebar.caption(
+    f"{n_matching} mappings match"
+    + (f" · max relevance {max_matching:.2f}" if n_matching else "")
+)
 
 search = st.sidebar.text_input("Search paper title")
 
+# Identifies the filtered rows for the tables' sort cache.
+table_version = (
+    reg.version, tuple(rq_filter), tuple(method_filter), tuple(trace_filter), min_relevance, search
+)
+
 filtered = df[
     (df["rq"].isin(rq_filter))
     & (df["method"].isin(method_filter))
@@ -121,54 +135,16 @@ show_graph = st.checkbox("Show relational graph", value=True)
 
 if show_graph:
 
-    net = Network(height="700px", width="100%", bgcolor="#ffffff", font_color="black")
-
-    # ---- add RQ nodes (left column)
-    rq_positions = {}
-    for i, rq in enumerate(sorted(filtered["rq"].unique())):
-        node_id = f"RQ::{i}"
-        rq_positions[rq] = node_id
-
-        net.add_node(
-            node_id,
-            label=f"RQ {i+1}",
-            title=rq,
-            shape="box",
-            color="#4F81BD",
-            x=-400,
-            y=i * 150,
-            fixed=True,
-            size=30,
-        )
-
-    # ---- add Paper nodes (right column)
-    paper_positions = {}
-    for j, pid in enumerate(sorted(filtered["paper_id"].unique())):
-        node_id = f"P::{pid}"
-        paper_positions[pid] = node_id
-
-        title = paper_lookup[pid]["input"]["title"]
-
-        net.add_node(
-            node_id,
-            label=title[:40] + "..." if len(title) > 40 else title,
-            title=title,
-            shape="ellipse",
-            color="#9BBB59",
-            x=400,
-            y=j * 120,
-            fixed=True,
-            size=20,
-        )
-
-    # ---- edges
-    for _, r in filtered.iterrows():
-        net.add_edge(rq_positions[r["rq"]], paper_positions[r["paper_id"]])
-
-    # ---- render
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".html") as tmp:
-        net.save_graph(tmp.name)
-        components.html(open(tmp.name, "r", encoding="utf-8").read(), height=750, scrolling=True)
+    max_papers = st.slider(
+        "Paper nodes before grouping per RQ", 50, 1000, MAX_PAPER_NODES, step=50
+    )
+
+    # Built in memory and cached by the filtered edge set; no temp files.
+    graph_html = render_mapping_graph_html(
+        filtered[["rq", "paper_id", "title", "relevance"]],
+        max_papers=max_papers,
+    )
+    components.html(graph_html, height=750, scrolling=True)
 
 # ================================
 # TABLE VIEW
@@ -176,10 +152,12 @@ if show_graph:
 
 st.subheader("📄 Mapping Table (RQ ↔ Paper)")
 
-st.dataframe(
-    filtered[["rq", "title", "method", "trace", "relevance", "regulatory"]]
-    .sort_values(["rq", "relevance"], ascending=[True, False]),
-    use_container_width=True,
+paged_table(
+    filtered[["rq", "title", "method", "trace", "relevance", "regulatory"]],
+    key="rqgraph_table",
+    sort_by=["rq", "relevance"],
+    ascending=[True, False],
+    version=table_version,
 )
 
 # ================================
@@ -305,11 +283,14 @@ else:
 
 st.divider()
 
-st.download_button(
-    "⬇️ Download registry.json",
-    data=json.dumps(registry, indent=2),
+lazy_download(
+    "registry.json",
+    "registry",
+    reg.version,
+    write_json(registry),
     file_name="registry.json",
     mime="application/json",
+    key="rqgraph_export",
 )
 
 
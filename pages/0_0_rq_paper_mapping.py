@@ -3,17 +3,12 @@
 # With TRUE Unique Papers + RQ Coverage
 # --------------------------------------------------
 
-import json
-from pathlib import Path
-import pandas as pd
 import streamlit as st
 
-# ================================
-# CONFIG
-# ================================
-
-BASE_DIR = Path(__file__).parents[1]   # as requested
-DATA_PATH = BASE_DIR / "data" / "registry.json"
+from pipeline.exports import write_json
+from pipeline.registry import load_registry, registry_path
+from viz.downloads import lazy_download
+from viz.paged_table import paged_table
 
 st.set_page_config(page_title="Global ESG Literature Map", layout="wide")
 st.title("🔗 Global Mapping: Research Questions ↔ Papers")
@@ -22,14 +17,15 @@ st.title("🔗 Global Mapping: Research Questions ↔ Papers")
 # LOAD DATA
 # ================================
 
+DATA_PATH = registry_path()
+
 if not DATA_PATH.exists():
     st.error(f"registry.json not found at: {DATA_PATH}")
     st.stop()
 
-with open(DATA_PATH, "r", encoding="utf-8") as f:
-    registry = json.load(f)
-
-tracks = registry.get("research_tracks", [])
+reg = load_registry(DATA_PATH)
+registry = reg.raw
+tracks = reg.tracks
 
 if not tracks:
     st.error("No research_tracks found in registry.json")
@@ -39,65 +35,22 @@ if not tracks:
 # BUILD GLOBAL MAPPING TABLE
 # ================================
 
-rows = []
-paper_lookup = {}
-
-for ti, t in enumerate(tracks):
-    rq_text = t["meta"].get("research_question", f"RQ_{ti}")
-
-    for p in t.get("papers", []):
-        pid = p.get("id")
-        title = p.get("input", {}).get("title")
+paper_lookup = reg.paper_lookup
 
-        rows.append({
-            "rq": rq_text,
-            "paper_id": pid,
-            "title": title,
-            "method": p.get("method_category"),
-            "trace": p.get("decision_trace_support"),
-            "relevance": p.get("relevance_score", 0.0),
-            "regulatory": ", ".join(p.get("regulatory_relevance", [])),
-        })
-
-        paper_lookup[pid] = p
-
-df = pd.DataFrame(rows)
+df = reg.papers[["rq", "paper_id", "title", "method", "trace", "relevance", "regulatory"]].copy()
+df["relevance"] = df["relevance"].fillna(0.0)
 
 if df.empty:
     st.warning("No paper mappings found.")
     st.stop()
 
-# ================================
-# NORMALIZE TITLE FOR DEDUP
-# ================================
-
-df["title_norm"] = (
-    df["title"]
-    .astype(str)
-    .str.lower()
-    .str.replace(r"[^a-z0-9]+", " ", regex=True)
-    .str.strip()
-)
-
 # ================================
 # TRUE UNIQUE PAPERS (MERGED)
 # ================================
 
-unique_df = (
-    df.groupby("title_norm")
-    .agg({
-        "title": "first",
-        "method": lambda x: ", ".join(sorted(set(x.dropna()))),
-        "trace": lambda x: ", ".join(sorted(set(x.dropna()))),
-        "relevance": "max",
-        "regulatory": lambda x: ", ".join(sorted(set(", ".join(x).split(", ")))),
-        "rq": lambda x: list(sorted(set(x))),
-        "paper_id": "first",
-    })
-    .reset_index(drop=True)
-)
-
-unique_df["rq_count"] = unique_df["rq"].apply(len)
+# Merged on normalized title once per registry version (pipeline.registry).
+unique = reg.unique
+unique_df = unique.table
 
 # ================================
 # SIDEBAR FILTERS
@@ -105,25 +58,73 @@ unique_df["rq_count"] = unique_df["rq"].apply(len)
 
 st.sidebar.header("🔍 Filters")
 
+# Facet counts are slices of the registry's count cube. session_state
+# already holds this run's selections, so every option count reflects the
+# other filters as they are now.
+cube = reg.cube
+facets = {
+    "rq": st.session_state.get("rqmap_rq"),
+    "method": st.session_state.get("rqmap_method"),
+    "trace": st.session_state.get("rqmap_trace"),
+}
+facet_min_relevance = st.session_state.get("rqmap_min_relevance", 0.7)
+
+
+def facet_label(dim):
+    counts = cube.facet_counts(dim, min_relevance=facet_min_relevance, **facets)
+    return lambda v: f"{v} ({counts.get(v, 0)})"
+
+
 rq_filter = st.sidebar.multiselect(
     "Research Questions",
-    sorted(df["rq"].unique().tolist()),
-    default=sorted(df["rq"].unique().tolist()),
+    cube.values["rq"],
+    default=cube.values["rq"],
+    key="rqmap_rq",
+    format_func=facet_label("rq"),
 )
 
 method_filter = st.sidebar.multiselect(
     "Method Category",
-    sorted(df["method"].dropna().unique().tolist()),
-    default=sorted(df["method"].dropna().unique().tolist()),
+    cube.values["method"],
+    default=cube.values["method"],
+    key="rqmap_method",
+    format_func=facet_label("method"),
 )
 
 trace_filter = st.sidebar.multiselect(
     "Decision Trace Support",
-    sorted(df["trace"].dropna().unique().tolist()),
-    default=sorted(df["trace"].dropna().unique().tolist()),
+    cube.values["trace"],
+    default=cube.values["trace"],
+    key="rqmap_trace",
+    format_func=facet_label("trace"),
+)
+
+min_relevance = st.sidebar.slider(
+    "Minimum relevance", 0.0, 1.0, 0.7, 0.01, key="rqmap_min_relevance"
 )
 
-min_relevance = st.sidebar.slider("Minimum relevance", 0.0, 1.0, 0.7, 0.01)
+n_matching, max_matching = cube.summary(
+    min_relevance=min_relevance,
+    rq=rq_filter,
+    method=method_filter,
+    trace=trace_filter,
+)
+st.sidebar.caption(
+    f"{n_matching} mappings match"
+    + (f" · max relevance {max_matching:.2f}" if n_matching else "")
+)
+
+with st.sidebar.expander("Regulatory labels in selection"):
+    regulatory_counts = cube.facet_counts(
+        "regulatory",
+        min_relevance=min_relevance,
+        rq=rq_filter,
+        method=method_filter,
+        trace=trace_filter,
+    )
+    for label, n in sorted(regulatory_counts.items(), key=lambda kv: -kv[1]):
+        if n:
+            st.caption(f"{label} ({n})")
 
 search = st.sidebar.text_input("Search paper title")
 
@@ -131,6 +132,11 @@ search = st.sidebar.text_input("Search paper title")
 # APPLY FILTERS (MAPPING)
 # ================================
 
+# Identifies the filtered rows for the tables' sort cache.
+table_version = (
+    reg.version, tuple(rq_filter), tuple(method_filter), tuple(trace_filter), min_relevance, search
+)
+
 filtered = df[
     (df["rq"].isin(rq_filter))
     & (df["method"].isin(method_filter))
@@ -146,9 +152,9 @@ if search:
 # ================================
 
 unique_filtered = unique_df[
-    (unique_df["method"].str.contains("|".join(method_filter), na=False))
-    & (unique_df["trace"].str.contains("|".join(trace_filter), na=False))
-    & (unique_df["relevance"] >= min_relevance)
+    unique.label_mask("method", method_filter)
+    & unique.label_mask("trace", trace_filter)
+    & (unique_df["relevance"] >= min_relevance).to_numpy()
 ]
 
 if search:
@@ -176,20 +182,24 @@ if view_mode == "RQ ↔ Paper Mapping":
 
     st.markdown("##### Mapping Table (RQ ↔ Paper)")
 
-    st.dataframe(
-        filtered[["rq", "title", "method", "trace", "relevance", "regulatory"]]
-        .sort_values(["rq", "relevance"], ascending=[True, False]),
-        use_container_width=True,
+    paged_table(
+        filtered[["rq", "title", "method", "trace", "relevance", "regulatory"]],
+        key="rqmap_mapping_table",
+        sort_by=["rq", "relevance"],
+        ascending=[True, False],
+        version=table_version,
     )
 
 else:
 
     st.markdown("##### Unique Papers (Deduplicated)")
 
-    st.dataframe(
-        unique_filtered[["title", "rq_count", "method", "trace", "relevance", "regulatory"]]
-        .sort_values(["rq_count", "relevance"], ascending=[False, False]),
-        use_container_width=True,
+    paged_table(
+        unique_filtered[["title", "rq_count", "method", "trace", "relevance", "regulatory"]],
+        key="rqmap_unique_table",
+        sort_by=["rq_count", "relevance"],
+        ascending=[False, False],
+        version=table_version,
     )
 
 # ================================
@@ -261,11 +271,14 @@ else:
 
 st.divider()
 
-st.download_button(
-    "⬇️ Download registry.json",
-    data=json.dumps(registry, indent=2),
+lazy_download(
+    "registry.json",
+    "registry",
+    reg.version,
+    write_json(registry),
     file_name="registry.json",
     mime="application/json",
+    key="rqmap_export",
 )
 
 
@@ -3,6 +3,11 @@ import pandas as pd
 import re
 from pathlib import Path
 
+from pipeline.exports import frame_version, write_csv
+from pipeline.timing import start_run, span, write_run
+from viz.downloads import lazy_download
+from viz.paged_table import paged_table
+
 # =====================================================
 # CONFIG
 # =====================================================
@@ -11,6 +16,8 @@ st.set_page_config(page_title="ACL Abstract Explorer", layout="wide")
 st.title("📚 ACL Bib Abstract Explorer (Upload Master Bib)")
 st.caption("Venue bib + uploaded anthology+abstracts.bib (local join, no web scraping)")
 
+start_run("0_acl")
+
 BASE_DIR = Path(__file__).resolve().parents[1]
 VENUE_DIR = BASE_DIR / "data" / "acl_anthology_new"
 
@@ -77,10 +84,11 @@ master_file = st.file_uploader(
 
 if not master_file:
     st.warning("Please upload anthology+abstracts.bib to enable abstract resolution.")
+    write_run()
     st.stop()
 
 # Build lookup once
-with st.spinner("Indexing master abstract database (first time only)..."):
+with st.spinner("Indexing master abstract database (first time only)..."), span("index_master_bib"):
     MASTER_LOOKUP = build_master_lookup_from_upload(master_file.getvalue())
 
 st.success(f"Master DB loaded: {len(MASTER_LOOKUP):,} papers indexed")
@@ -94,6 +102,7 @@ st.subheader("📁 Select ACL Venue Bib File")
 
 if not VENUE_DIR.exists():
     st.error(f"Venue directory not found: {VENUE_DIR}")
+    write_run()
     st.stop()
 
 venue_files = sorted(VENUE_DIR.glob("*.bib"))
@@ -110,8 +119,10 @@ st.caption(f"Source: `{selected_bib.relative_to(BASE_DIR)}`")
 # STEP 3 — PARSE VENUE
 # =====================================================
 
-text = selected_bib.read_text(encoding="utf-8", errors="ignore")
-df = parse_bib_entries(text)
+with span("parse_venue_bib") as s:
+    text = selected_bib.read_text(encoding="utf-8", errors="ignore")
+    df = parse_bib_entries(text)
+    s["rows_out"] = len(df)
 
 # =====================================================
 # STEP 4 — LOCAL JOIN
@@ -126,20 +137,21 @@ status = st.empty()
 abstracts = []
 dois = []
 
-for i, row in df.iterrows():
-    abs_val = row["abstract"]
-    doi_val = row["doi"]
+with span("resolve_abstracts", rows=len(df)):
+    for i, row in df.iterrows():
+        abs_val = row["abstract"]
+        doi_val = row["doi"]
 
-    if row["acl_id"] in MASTER_LOOKUP:
-        master = MASTER_LOOKUP[row["acl_id"]]
-        abs_val = abs_val or master["abstract"]
-        doi_val = doi_val or master["doi"]
+        if row["acl_id"] in MASTER_LOOKUP:
+            master = MASTER_LOOKUP[row["acl_id"]]
+            abs_val = abs_val or master["abstract"]
+            doi_val = doi_val or master["doi"]
 
-    abstracts.append(abs_val)
-    dois.append(doi_val)
+        abstracts.append(abs_val)
+        dois.append(doi_val)
 
-    progress.progress((i + 1) / len(df))
-    status.text(f"Resolving {i+1}/{len(df)}")
+        progress.progress((i + 1) / len(df))
+        status.text(f"Resolving {i+1}/{len(df)}")
 
 df["abstract"] = abstracts
 df["doi"] = dois
@@ -162,25 +174,27 @@ col4.metric("Matched in Master DB", df["acl_id"].isin(MASTER_LOOKUP).sum())
 
 st.subheader("📄 Extracted Records (Selected Venue Only)")
 
-st.dataframe(
-    df[["title", "doi", "abstract"]],
-    use_container_width=True,
-    height=600
-)
+# Abstracts are cut in the table; full text of a row opens on demand.
+df_version = frame_version(df)
+paged_table(df[["title", "doi", "abstract"]], key="acl_venue_table", height=600, version=df_version)
 
 # =====================================================
 # DOWNLOAD
 # =====================================================
 
-csv = df.to_csv(index=False).encode("utf-8")
-
-st.download_button(
-    "⬇️ Download Enriched CSV",
-    data=csv,
+lazy_download(
+    "Enriched CSV",
+    "acl_venue",
+    df_version,
+    write_csv(df),
     file_name=selected_bib.stem + "_with_abstracts.csv",
-    mime="text/csv"
+    mime="text/csv",
+    key="acl_venue_export",
+    allow_compress=True,
 )
 
+write_run()
+
 
 
 # import streamlit as st
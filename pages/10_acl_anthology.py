@@ -6,6 +6,11 @@ from bibtexparser.bparser import BibTexParser
 from bibtexparser.customization import convert_to_unicode
 import re
 
+from pipeline.exports import frame_version, write_csv
+from pipeline.timing import start_run, span, write_run
+from viz.downloads import lazy_download
+from viz.paged_table import paged_table
+
 # =====================================================
 # CONFIG
 # =====================================================
@@ -13,6 +18,8 @@ import re
 st.set_page_config(page_title="BibTeX Batch Abstract Search", layout="wide")
 st.title("🔍 BibTeX Abstract Search (Batch Mode)")
 
+start_run("10_acl_anthology")
+
 DATA_DIR = Path("data/acl_anthology")
 
 st.markdown("""
@@ -80,14 +87,16 @@ else:
 
 if not bibtex_text:
     st.info("Load a BibTeX file to begin.")
+    write_run()
     st.stop()
 
 # =====================================================
 # SPLIT & COUNT
 # =====================================================
 
-with st.spinner("Indexing BibTeX entries (fast)..."):
+with st.spinner("Indexing BibTeX entries (fast)..."), span("split_bibtex") as s:
     all_entries = load_entries(bibtex_text)
+    s["rows_out"] = len(all_entries)
 
 TOTAL = len(all_entries)
 st.success(f"Detected {TOTAL:,} BibTeX entries")
@@ -118,6 +127,7 @@ end_idx = c2.number_input(
 
 if start_idx >= end_idx:
     st.error("Start must be smaller than End")
+    write_run()
     st.stop()
 
 subset_raw = all_entries[int(start_idx):int(end_idx)]
@@ -132,7 +142,7 @@ parser.customization = convert_to_unicode
 
 rows = []
 
-with st.spinner("Parsing selected batch..."):
+with st.spinner("Parsing selected batch..."), span("parse_bibtex_batch", rows=len(subset_raw)):
     for raw in subset_raw:
         try:
             db = bibtexparser.loads(raw, parser=parser)
@@ -189,6 +199,7 @@ if venue_filter:
     )
 
 filtered = df[mask]
+filtered_version = frame_version(filtered)
 st.success(f"Matched {len(filtered)} entries in batch")
 
 # =====================================================
@@ -203,7 +214,8 @@ show_cols = st.multiselect(
     default=["title", "author", "year", "booktitle", "url"]
 )
 
-st.dataframe(filtered[show_cols], use_container_width=True)
+# Sorted and paged server-side; only the visible page is sent.
+paged_table(filtered[show_cols], key="acl_batch_table", version=filtered_version)
 
 # =====================================================
 # ABSTRACT PREVIEW
@@ -237,13 +249,20 @@ else:
 
 st.subheader("⬇️ Export")
 
-st.download_button(
-    "Download filtered CSV (current batch)",
-    filtered.to_csv(index=False).encode("utf-8"),
+# Written (and cached per result version) only when requested.
+lazy_download(
+    "filtered CSV (current batch)",
+    "acl_batch",
+    filtered_version,
+    write_csv(filtered),
     file_name=f"bibtex_batch_{start_idx}_{end_idx}_filtered.csv",
-    mime="text/csv"
+    mime="text/csv",
+    key="acl_batch_export",
+    allow_compress=True,
 )
 
+write_run()
+
 
 
 # import streamlit as st
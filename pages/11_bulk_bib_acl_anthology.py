@@ -4,6 +4,8 @@ import requests
 from pathlib import Path
 from datetime import datetime
 
+from pipeline.timing import start_run, span, write_run
+
 # =====================================================
 # CONFIG
 # =====================================================
@@ -11,6 +13,8 @@ from datetime import datetime
 st.set_page_config(page_title="ACL BibTeX Bulk Downloader", layout="wide")
 st.title("⬇️ ACL BibTeX Downloader (Single + Bulk with Logs)")
 
+start_run("11_bulk_bib_acl_anthology")
+
 BASE_DIR = Path("data/acl_anthology_new")
 BASE_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -125,7 +129,8 @@ if mode == "Bulk Download (paste URLs)":
 
             for i, url in enumerate(urls):
                 try:
-                    r = requests.get(url, timeout=30)
+                    with span("fetch_bibtex"):
+                        r = requests.get(url, timeout=30)
                     r.raise_for_status()
 
                     filename = url.split("/")[-1]
@@ -178,3 +183,5 @@ if files:
     st.dataframe(file_table, use_container_width=True)
 else:
     st.info("No BibTeX files downloaded yet.")
+
+write_run()
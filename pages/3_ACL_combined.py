@@ -2,6 +2,9 @@ import streamlit as st
 import pandas as pd
 import requests
 
+from pipeline.exports import frame_version, write_blocks, write_csv
+from viz.downloads import lazy_download
+
 st.set_page_config(page_title="ACL CSV Cleaner", layout="wide")
 st.title("🧹 ACL CSV Cleaner → Clean CSV + BibTeX + Markdown")
 
@@ -179,18 +182,16 @@ for i, url in enumerate(clean["bib_url"]):
             bib_errors += 1
     progress.progress((i + 1) / len(clean))
 
-combined_bibtex = "\n\n".join(bibtex_entries)
-
 st.success(f"Fetched {len(bibtex_entries)} BibTeX entries | Errors: {bib_errors}")
 
 # ---------------------------------------------------------
 # STEP 8 — Build Markdown Literature File
 # ---------------------------------------------------------
 
-md_blocks = []
-
-for _, row in clean.iterrows():
-    md = f"""### {row['title']}
+def md_blocks():
+    """Markdown literature blocks, generated only when the export is written."""
+    for _, row in clean.iterrows():
+        yield f"""### {row['title']}
 
 **Authors:** {row['authors']}  
 **PDF:** {row['pdf']}  
@@ -201,9 +202,6 @@ for _, row in clean.iterrows():
 
 ---
 """
-    md_blocks.append(md)
-
-combined_md = "\n".join(md_blocks)
 
 # ---------------------------------------------------------
 # STEP 9 — Final Clean CSV
@@ -232,23 +230,38 @@ st.dataframe(final.head(20))
 
 st.subheader("⬇️ Downloads")
 
-st.download_button(
-    "Download Clean CSV",
-    final.to_csv(index=False).encode("utf-8"),
+# Exports are written on request and cached per data version.
+data_version = frame_version(clean[["title", "authors", "pdf", "bib_url", "abstract"]])
+bib_version = frame_version(pd.DataFrame({"bibtex": bibtex_entries}))
+
+lazy_download(
+    "Clean CSV",
+    "acl_combined_csv",
+    data_version,
+    write_csv(final),
     file_name="acl_clean.csv",
-    mime="text/csv"
+    mime="text/csv",
+    key="acl_combined_csv",
 )
 
-st.download_button(
-    "Download Combined BibTeX",
-    combined_bibtex.encode("utf-8"),
+lazy_download(
+    "Combined BibTeX",
+    "acl_combined_bib",
+    bib_version,
+    write_blocks(bibtex_entries, sep="\n\n"),
     file_name="acl_combined.bib",
-    mime="text/plain"
+    mime="text/plain",
+    key="acl_combined_bib",
+    allow_compress=True,
 )
 
-st.download_button(
-    "Download Combined Markdown",
-    combined_md.encode("utf-8"),
+lazy_download(
+    "Combined Markdown",
+    "acl_combined_md",
+    data_version,
+    write_blocks(md_blocks),
     file_name="acl_literature.md",
-    mime="text/markdown"
+    mime="text/markdown",
+    key="acl_combined_md",
+    allow_compress=True,
 )
@@ -1,4 +1,10 @@
+import re
+
+import numpy as np
 import pandas as pd
+
+from pipeline.timing import timed
+
 # def clean_keywords(df: pd.DataFrame):
 #     df = df.copy()
 #     df["keywords"] = (
@@ -11,37 +17,43 @@ import pandas as pd
 #     df["keywords"] = df["keywords"].apply(lambda x: [k.strip() for k in x if k.strip()])
 #     return df
 
-def filter_nonempty_keywords(df):
-    return df[df["keywords"].apply(len) > 0]
+RENAME_MAP = {
+    "Title": "title",
+    "Abstract": "abstract",
+    "Tags": "keywords",
+    "Journal": "venue",
+    "Year": "year"
+}
 
-def clean_keywords(df):
-    df = df.copy()
+CONFERENCE_KEYWORDS = [
+    "conference",
+    "proceedings",
+    "symposium",
+    "workshop",
+    "congress",
+    "ieee",
+    "acm"
+]
 
-    if "keywords" not in df.columns:
-        df["keywords"] = [[] for _ in range(len(df))]
-        return df
+_CONFERENCE_RE = re.compile("|".join(map(re.escape, CONFERENCE_KEYWORDS)))
 
-    def parse_keywords(x):
-        if not isinstance(x, str):
-            return []
-        if x.strip() == "":
-            return []
-        return [k.strip().lower() for k in x.split(";") if k.strip()]
 
-    df["keywords"] = df["keywords"].apply(parse_keywords)
-    return df
+# -----------------------------
+# In-place steps (no copies)
+# -----------------------------
 
+def _as_text(series):
+    """
+    Object-dtype view usable with the .str accessor.
+    Columns that cannot hold strings (e.g. all-numeric) become all-NaN.
+    """
+    if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+        return pd.Series(series.to_numpy(dtype=object), index=series.index)
+    return pd.Series(np.nan, index=series.index, dtype=object)
 
-def normalize_columns(df):
-    rename_map = {
-        "Title": "title",
-        "Abstract": "abstract",
-        "Tags": "keywords",
-        "Journal": "venue",
-        "Year": "year"
-    }
 
-    df = df.rename(columns=rename_map)
+def _normalize_columns_inplace(df):
+    df.rename(columns=RENAME_MAP, inplace=True)
 
     for col in ["keywords", "abstract"]:
         if col not in df:
@@ -49,8 +61,8 @@ def normalize_columns(df):
 
     return df
 
-def clean_abstracts(df):
-    df = df.copy()
+
+def _clean_abstracts_inplace(df):
     df["abstract"] = (
         df["abstract"]
         .fillna("")
@@ -59,33 +71,98 @@ def clean_abstracts(df):
     )
     return df
 
-def infer_source_type(df):
+
+def _parse_keywords(series):
     """
-    Infer whether a paper is from a journal or conference
-    based on venue name heuristics.
+    "a; B ;c" -> ["a", "b", "c"] in one pass over the raw values.
+    Non-string and blank values become [].
     """
-    df = df.copy()
+    strip = str.strip
+    parsed = [
+        list(filter(None, map(strip, x.lower().split(";"))))
+        if isinstance(x, str) else []
+        for x in series.to_numpy(dtype=object)
+    ]
+    return pd.Series(parsed, index=series.index, dtype=object)
 
-    def classify(venue):
-        if not isinstance(venue, str):
-            return "unknown"
 
-        v = venue.lower()
+def _clean_keywords_inplace(df):
+    if "keywords" not in df.columns:
+        df["keywords"] = [[] for _ in range(len(df))]
+        return df
 
-        conference_keywords = [
-            "conference",
-            "proceedings",
-            "symposium",
-            "workshop",
-            "congress",
-            "ieee",
-            "acm"
-        ]
+    df["keywords"] = _parse_keywords(df["keywords"])
+    return df
+
+
+def _classify_venue(venue, venue_types):
+    if venue in venue_types:
+        return venue_types[venue]
+    if _CONFERENCE_RE.search(venue):
+        return "conference"
+    return "journal"
 
-        if any(k in v for k in conference_keywords):
-            return "conference"
 
-        return "journal"
+def _infer_source_type_inplace(df, venue_types=None):
+    """
+    Classify each distinct venue once and map the result back to rows.
+    `venue_types` is an optional lowercase venue -> source_type dictionary
+    (see pipeline.venues.build_venue_type_map) consulted before the regex.
+    """
+    if "venue" not in df:
+        df["source_type"] = "unknown"
+        return df
 
-    df["source_type"] = df["venue"].apply(classify)
+    lowered = _as_text(df["venue"]).str.lower().str.strip()
+    codes, uniques = pd.factorize(lowered)
+
+    venue_types = venue_types or {}
+    # factorize codes NaN as -1, which indexes the trailing "unknown".
+    types = np.array(
+        [_classify_venue(v, venue_types) for v in uniques] + ["unknown"],
+        dtype=object
+    )
+
+    df["source_type"] = types[codes]
     return df
+
+
+# -----------------------------
+# Public API
+# -----------------------------
+
+@timed("clean_corpus")
+def clean_corpus(df, inplace=False, venue_types=None):
+    """
+    Run normalize_columns, clean_abstracts, clean_keywords and
+    infer_source_type as a single pass with at most one copy of the frame.
+    """
+    if not inplace:
+        df = df.copy()
+
+    _normalize_columns_inplace(df)
+    _clean_abstracts_inplace(df)
+    _clean_keywords_inplace(df)
+    _infer_source_type_inplace(df, venue_types=venue_types)
+    return df
+
+
+def filter_nonempty_keywords(df):
+    return df[df["keywords"].apply(len) > 0]
+
+def clean_keywords(df):
+    return _clean_keywords_inplace(df.copy())
+
+
+def normalize_columns(df):
+    return _normalize_columns_inplace(df.copy())
+
+def clean_abstracts(df):
+    return _clean_abstracts_inplace(df.copy())
+
+def infer_source_type(df, venue_types=None):
+    """
+    Infer whether a paper is from a journal or conference
+    based on venue name heuristics.
+    """
+    return _infer_source_type_inplace(df.copy(), venue_types=venue_types)
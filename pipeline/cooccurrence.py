@@ -1,8 +1,11 @@
 import itertools
-import networkx as nx
 from collections import Counter
+from pipeline.timing import timed
 
+@timed("build_cooccurrence_graph")
 def build_cooccurrence_graph(df, min_freq=5):
+    import networkx as nx
+
     pairs = []
 
     for kws in df["keywords"]:
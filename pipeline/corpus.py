@@ -0,0 +1,40 @@
+import pandas as pd
+
+from pipeline.loader import iter_papers
+from pipeline.cleaner import clean_corpus
+from pipeline.keyword_extractor import generate_fallback_keywords
+from pipeline.timing import timed
+
+
+@timed("load_clean_corpus")
+def load_clean_corpus(source, venue_types=None):
+    """
+    Load and clean a paper file batch by batch, so only one raw chunk
+    is alive at a time.
+    """
+    return pd.concat(
+        [
+            clean_corpus(chunk, inplace=True, venue_types=venue_types)
+            for chunk in iter_papers(source)
+        ],
+        ignore_index=True
+    )
+
+
+def has_keywords(df):
+    return df["keywords"].apply(len).sum() > 0
+
+
+@timed("prepare_corpus")
+def prepare_corpus(source, venue_types=None, fallback=generate_fallback_keywords):
+    """
+    Shared load -> clean -> keyword fallback chain used by app.py and cli.py.
+    Returns (df, used_fallback).
+    """
+    df = load_clean_corpus(source, venue_types=venue_types)
+
+    used_fallback = not has_keywords(df)
+    if used_fallback:
+        df["keywords"] = fallback(df)
+
+    return df, used_fallback
@@ -0,0 +1,326 @@
+"""
+Near-duplicate detection across Litmaps exports, ACL Anthology bibs and
+data/registry.json.
+
+    records = load_dedup_sources()
+    dups = duplicate_clusters(records, threshold=0.8)
+
+Titles are normalized like `title_norm` in pages/0_0_rq_paper_mapping.py,
+cut into character k-grams and MinHashed with NumPy. LSH banding only
+compares rows that share a band bucket, so merging large corpora never
+needs an all-pairs comparison.
+"""
+
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pipeline.timing import timed
+
+BASE_DIR = Path(__file__).parents[1]
+LITMAP_DIR = BASE_DIR / "data" / "litmap"
+BIB_DIR = BASE_DIR / "data" / "acl_anthology_new"
+REGISTRY_PATH = BASE_DIR / "data" / "registry.json"
+
+RECORD_COLUMNS = ["source", "id", "doi", "title", "abstract"]
+
+SHINGLE_SIZE = 5      # characters per shingle, packed into one uint64 (<= 8)
+NUM_PERM = 64
+BANDS = 16            # 16 bands x 4 rows: pairs above ~0.5 Jaccard become candidates
+THRESHOLD = 0.8       # estimated Jaccard needed to call two rows duplicates
+ABSTRACT_CHARS = 300  # abstract prefix appended to the title when use_abstract=True
+
+# Max elements of one (permutations x shingles) hash block. Small enough
+# for the block to stay in cache: at 200k titles 1<<20 is ~3x faster than
+# one block per permutation and needs a fraction of the memory.
+_BLOCK_SIZE = 1 << 20
+_BAND_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+_BIB_ENTRY_RE = re.compile(r"^@(\w+)\s*\{\s*([^,\s]+)\s*,", re.MULTILINE)
+_BIB_FIELD_RE = re.compile(
+    r'^\s*(title|abstract|doi)\s*=\s*"(.*?)",?\s*$',
+    re.MULTILINE | re.DOTALL | re.IGNORECASE,
+)
+
+
+# ================================
+# SOURCES
+# ================================
+
+def litmap_records(paths=None):
+    """Title/abstract records from Litmaps CSV exports."""
+    paths = sorted(LITMAP_DIR.glob("*.csv")) if paths is None else paths
+    frames = []
+
+    for path in paths:
+        df = pd.read_csv(path, usecols=lambda c: c in {"DOI", "Title", "Abstract"})
+        frames.append(pd.DataFrame({
+            "source": f"litmap:{Path(path).name}",
+            "id": df.get("DOI"),
+            "doi": df.get("DOI"),
+            "title": df.get("Title"),
+            "abstract": df.get("Abstract"),
+        }))
+
+    return _concat(frames)
+
+
+def _bib_entries(text):
+    starts = list(_BIB_ENTRY_RE.finditer(text))
+    for m, nxt in zip(starts, starts[1:] + [None]):
+        if m.group(1).lower() == "proceedings":
+            continue
+        body = text[m.end():nxt.start() if nxt else len(text)]
+        fields = {k.lower(): v for k, v in _BIB_FIELD_RE.findall(body)}
+        yield m.group(2), fields
+
+
+def bib_records(paths=None):
+    """
+    Title/abstract records from ACL Anthology .bib exports.
+    Uses a field regex rather than bibtexparser: the Anthology writes one
+    `field = "value",` per line, and this is much faster on full volumes.
+    """
+    paths = sorted(BIB_DIR.glob("*.bib")) if paths is None else paths
+    rows = []
+
+    for path in paths:
+        text = Path(path).read_text(encoding="utf-8", errors="ignore")
+        for key, fields in _bib_entries(text):
+            rows.append({
+                "source": f"bib:{Path(path).name}",
+                "id": key,
+                "doi": fields.get("doi"),
+                "title": fields.get("title", "").replace("{", "").replace("}", ""),
+                "abstract": fields.get("abstract"),
+            })
+
+    return pd.DataFrame(rows, columns=RECORD_COLUMNS)
+
+
+def registry_records(path=REGISTRY_PATH):
+    """One record per paper per research track in registry.json."""
+    with open(path, "r", encoding="utf-8") as f:
+        registry = json.load(f)
+
+    rows = []
+    for track in registry.get("research_tracks", []):
+        for p in track.get("papers", []):
+            inp = p.get("input", {})
+            rows.append({
+                "source": f"registry:{track.get('id')}",
+                "id": p.get("id"),
+                "doi": inp.get("doi"),
+                "title": inp.get("title"),
+                "abstract": inp.get("abstract"),
+            })
+
+    return pd.DataFrame(rows, columns=RECORD_COLUMNS)
+
+
+def _concat(frames):
+    if not frames:
+        return pd.DataFrame(columns=RECORD_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[RECORD_COLUMNS]
+
+
+def load_dedup_sources():
+    """All three sources stacked into one RECORD_COLUMNS frame."""
+    return _concat([litmap_records(), bib_records(), registry_records()])
+
+
+# ================================
+# MINHASH / LSH
+# ================================
+
+def normalize_titles(titles):
+    """Same normalization as `title_norm`: lowercase a-z0-9 words."""
+    return (
+        pd.Series(titles)
+        .fillna("")
+        .astype(str)
+        .str.lower()
+        .str.replace(r"[^a-z0-9]+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def _shingle_hashes(texts, k=SHINGLE_SIZE):
+    """
+    Pack every character k-gram of every text into a uint64.
+    Returns (hashes, counts) with hashes grouped by text in order.
+    Texts shorter than k become one padded shingle; empty texts get none.
+    """
+    texts = [t.ljust(k) if t else t for t in texts]
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    counts = np.maximum(lengths - k + 1, 0)
+
+    buf = np.frombuffer("".join(texts).encode("ascii"), dtype=np.uint8)
+    text_starts = np.cumsum(lengths) - lengths
+    shingle_starts = np.cumsum(counts) - counts
+
+    pos = (
+        np.arange(counts.sum())
+        - np.repeat(shingle_starts, counts)
+        + np.repeat(text_starts, counts)
+    )
+
+    hashes = np.zeros(len(pos), dtype=np.uint64)
+    for j in range(k):
+        hashes |= buf[pos + j].astype(np.uint64) << np.uint64(8 * j)
+
+    return hashes, counts
+
+
+def minhash_signatures(hashes, counts, num_perm=NUM_PERM, seed=0):
+    """
+    (n_texts, num_perm) uint32 MinHash signatures using multiply-shift
+    hashing, reduced per text with np.minimum.reduceat. Texts are hashed
+    in chunks of about _BLOCK_SIZE // num_perm shingles, all permutations
+    at once. Texts without shingles keep an all-max signature.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    sig = np.full((len(counts), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    rows = np.flatnonzero(counts > 0)
+    if not len(rows):
+        return sig
+
+    ends = np.cumsum(counts)[rows]
+    starts = ends - counts[rows]
+    chunk = max(1, _BLOCK_SIZE // num_perm)
+    a, b = a[:, None], b[:, None]
+
+    i = 0
+    with np.errstate(over="ignore"):
+        while i < len(rows):
+            # Whole texts only; a single text longer than `chunk` is one block.
+            j = max(i + 1, int(np.searchsorted(ends, starts[i] + chunk, side="right")))
+            lo, hi = starts[i], ends[j - 1]
+
+            hv = a * hashes[lo:hi]
+            hv += b
+            hv >>= np.uint64(32)
+            sig[rows[i:j]] = np.minimum.reduceat(
+                hv.astype(np.uint32), starts[i:j] - lo, axis=1
+            ).T
+            i = j
+
+    return sig
+
+
+def lsh_candidate_pairs(sig, valid, bands=BANDS):
+    """
+    Candidate (i, j) row pairs, i < j, sharing at least one band bucket.
+    Inside a bucket each row is paired with its neighbour and with the
+    bucket's first row instead of with every member, so huge buckets
+    (e.g. many identical titles) stay linear.
+    """
+    rows_per_band = sig.shape[1] // bands
+    idx = np.flatnonzero(valid)
+    if len(idx) < 2:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty
+
+    left, right = [], []
+
+    with np.errstate(over="ignore"):
+        for band in range(bands):
+            cols = sig[idx, band * rows_per_band:(band + 1) * rows_per_band]
+            key = np.zeros(len(idx), dtype=np.uint64)
+            for col in cols.T:
+                key = key * _BAND_MIX + col.astype(np.uint64)
+
+            order = np.argsort(key, kind="stable")
+            sorted_key = key[order]
+            same = sorted_key[1:] == sorted_key[:-1]
+
+            members = idx[order]
+            left.append(members[:-1][same])
+            right.append(members[1:][same])
+
+            run_start = np.maximum.accumulate(
+                np.where(np.r_[True, ~same], np.arange(len(members)), 0)
+            )
+            not_first = run_start != np.arange(len(members))
+            left.append(members[run_start[not_first]])
+            right.append(members[not_first])
+
+    u, v = np.concatenate(left), np.concatenate(right)
+    u, v = np.minimum(u, v), np.maximum(u, v)
+
+    pairs = np.unique(u.astype(np.int64) * len(sig) + v)
+    return pairs // len(sig), pairs % len(sig)
+
+
+def _connected_components(n, u, v):
+    """Label each row with the smallest row index in its component."""
+    labels = np.arange(n)
+    while len(u):
+        m = np.minimum(labels[u], labels[v])
+        changed = (labels[u] != m) | (labels[v] != m)
+        np.minimum.at(labels, u, m)
+        np.minimum.at(labels, v, m)
+        labels = labels[labels]
+        if not changed.any():
+            break
+    return labels
+
+
+@timed("near_duplicate_clusters")
+def near_duplicate_clusters(
+    titles,
+    abstracts=None,
+    threshold=THRESHOLD,
+    shingle_size=SHINGLE_SIZE,
+    num_perm=NUM_PERM,
+    bands=BANDS,
+    seed=0,
+):
+    """
+    Cluster label per row (the position of the cluster's first row).
+    Rows with no usable title are their own singleton cluster.
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm must be a multiple of bands")
+    if not 1 <= shingle_size <= 8:
+        raise ValueError("shingle_size must be between 1 and 8")
+
+    text = normalize_titles(titles)
+    if abstracts is not None:
+        abstract = normalize_titles(abstracts).str.slice(0, ABSTRACT_CHARS)
+        text = (text + " " + abstract).str.strip()
+
+    hashes, counts = _shingle_hashes(text.tolist(), k=shingle_size)
+    sig = minhash_signatures(hashes, counts, num_perm=num_perm, seed=seed)
+
+    u, v = lsh_candidate_pairs(sig, counts > 0, bands=bands)
+    similar = (sig[u] == sig[v]).mean(axis=1) >= threshold
+
+    return _connected_components(len(sig), u[similar], v[similar])
+
+
+def duplicate_clusters(records, threshold=THRESHOLD, use_abstract=False, **kwargs):
+    """
+    Rows of `records` that have at least one near-duplicate, with
+    `cluster` and `cluster_size` columns, sorted by cluster.
+    """
+    labels = near_duplicate_clusters(
+        records["title"],
+        records["abstract"] if use_abstract else None,
+        threshold=threshold,
+        **kwargs,
+    )
+
+    out = records.assign(cluster=labels)
+    out["cluster_size"] = out.groupby("cluster")["cluster"].transform("size")
+
+    return (
+        out[out["cluster_size"] > 1]
+        .sort_values(["cluster_size", "cluster"], ascending=[False, True], kind="stable")
+    )
@@ -0,0 +1,109 @@
+"""
+Export files for download buttons, built on request and cached on disk.
+
+    path = export_file("registry", reg.version, write_json(registry), suffix=".json")
+
+Each export is identified by a name and a data version. The first request
+for a version streams the payload into data/exports/ (optionally gzip),
+and every later request reuses that file. Older versions of the same name
+are deleted. Nothing is serialized on reruns where no export is requested.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).parents[1]
+EXPORT_DIR = BASE_DIR / "data" / "exports"
+
+CSV_CHUNK_ROWS = 10_000
+
+
+def frame_version(df):
+    """Content hash of a DataFrame; far cheaper than serializing it."""
+    h = hashlib.sha1(",".join(map(str, df.columns)).encode())
+    # categorize=False: factorizing first costs more than it saves on
+    # mostly-unique text columns.
+    h.update(pd.util.hash_pandas_object(df, index=False, categorize=False).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+def _file_name(name, version, suffix, compress):
+    digest = hashlib.sha1(str(version).encode()).hexdigest()[:16]
+    return f"{name}-{digest}{suffix}" + (".gz" if compress else "")
+
+
+def cached_export(name, version, suffix, compress=False, export_dir=EXPORT_DIR):
+    """Path of an already built export, or None."""
+    path = Path(export_dir) / _file_name(name, version, suffix, compress)
+    return path if path.exists() else None
+
+
+def export_file(name, version, writer, suffix, compress=False, export_dir=EXPORT_DIR):
+    """
+    Path of the `name` export for `version`, calling writer(text_file) to
+    stream it to disk only if it is not cached yet.
+    """
+    export_dir = Path(export_dir)
+    path = export_dir / _file_name(name, version, suffix, compress)
+    if path.exists():
+        return path
+
+    export_dir.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+
+    opener = gzip.open if compress else open
+    try:
+        with opener(tmp, "wt", encoding="utf-8", newline="") as f:
+            writer(f)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    # Only the latest version of each export is kept (plain and gzip).
+    # Another session may be serving an older one; readers fall back to
+    # rebuilding (see viz.downloads), and files still open elsewhere are
+    # left for the next prune.
+    current = path.name.split(".", 1)[0]
+    older = re.compile(rf"{re.escape(name)}-[0-9a-f]{{16}}\..+")
+    for old in export_dir.iterdir():
+        if older.fullmatch(old.name) and not old.name.startswith(current + "."):
+            try:
+                old.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    return path
+
+
+# ================================
+# WRITERS
+# ================================
+
+def write_json(obj, indent=2):
+    def writer(f):
+        json.dump(obj, f, indent=indent, ensure_ascii=False)
+    return writer
+
+
+def write_csv(df, chunk_rows=CSV_CHUNK_ROWS):
+    def writer(f):
+        df.to_csv(f, index=False, chunksize=chunk_rows)
+    return writer
+
+
+def write_blocks(blocks, sep="\n"):
+    """Writer for an iterable (or generator function) of text blocks."""
+    def writer(f):
+        for i, block in enumerate(blocks() if callable(blocks) else blocks):
+            if i:
+                f.write(sep)
+            f.write(block)
+    return writer
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+
+class FilterIndex:
+    """
+    Precomputed bitmaps for the app.py sidebar filters, built once per corpus.
+
+    - one boolean bitmap per source type
+    - a year-sorted row permutation, so a year range is two binary searches
+    - a bitmap of rows with at least one keyword
+    """
+
+    def __init__(self, df):
+        self.n = len(df)
+
+        codes, types = pd.factorize(df["source_type"])
+        self.source_types = sorted(types)
+        self.source_bitmaps = {t: codes == i for i, t in enumerate(types)}
+
+        years = pd.to_numeric(df["year"], errors="coerce").to_numpy(dtype=float)
+        # NaN years sort last and are never inside a finite range.
+        self.year_order = np.argsort(years, kind="stable")
+        self.sorted_years = years[self.year_order]
+
+        valid = self.sorted_years[~np.isnan(self.sorted_years)]
+        self.year_min = int(valid[0]) if len(valid) else None
+        self.year_max = int(valid[-1]) if len(valid) else None
+
+        self.nonempty_keywords = df["keywords"].str.len().fillna(0).to_numpy() > 0
+
+    def source_mask(self, selected):
+        mask = np.zeros(self.n, dtype=bool)
+        for t in selected:
+            if t in self.source_bitmaps:
+                mask |= self.source_bitmaps[t]
+        return mask
+
+    def year_mask(self, lo, hi):
+        start = np.searchsorted(self.sorted_years, lo, side="left")
+        stop = np.searchsorted(self.sorted_years, hi, side="right")
+
+        mask = np.zeros(self.n, dtype=bool)
+        mask[self.year_order[start:stop]] = True
+        return mask
+
+    def mask(self, selected_sources, year_range, nonempty_keywords=False):
+        mask = self.source_mask(selected_sources) & self.year_mask(*year_range)
+        if nonempty_keywords:
+            mask &= self.nonempty_keywords
+        return mask
+
+    def rows(self, mask):
+        """Positional row indices for `df.iloc`."""
+        return np.flatnonzero(mask)
@@ -0,0 +1,33 @@
+from pipeline.timing import timed
+
+
+@timed("generate_fallback_keywords")
+def generate_fallback_keywords(df, top_k=5):
+    """
+    TF-IDF keywords from title + abstract, used when a corpus has no
+    author keywords at all.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    texts = (
+        df["title"].fillna("") + " " + df["abstract"].fillna("")
+    ).tolist()
+
+    vectorizer = TfidfVectorizer(
+        stop_words="english",
+        max_features=1000,
+        ngram_range=(1, 2)
+    )
+
+    X = vectorizer.fit_transform(texts)
+    terms = vectorizer.get_feature_names_out()
+
+    keywords = []
+    for row in X:
+        if row.nnz == 0:
+            keywords.append([])
+        else:
+            idx = row.toarray()[0].argsort()[-top_k:]
+            keywords.append([terms[i] for i in idx])
+
+    return keywords
@@ -0,0 +1,55 @@
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+
+class KeywordIndex:
+    """
+    Sorted keyword vocabulary for prefix autocomplete, built once per corpus.
+
+    - `keywords`: every distinct keyword, sorted, so a prefix is one
+      contiguous slice found with two binary searches
+    - `rows` / `codes`: one entry per (paper, keyword) occurrence, so the
+      frequencies of any filtered subset are a single np.bincount
+    """
+
+    def __init__(self, df):
+        exploded = pd.Series(df["keywords"].to_numpy()).explode().dropna()
+
+        codes, keywords = pd.factorize(exploded, sort=True)
+        self.keywords = list(keywords)
+        self.codes = codes
+        self.rows = exploded.index.to_numpy()
+
+        self.freqs = self.frequencies()
+
+    def frequencies(self, mask=None):
+        """Keyword counts over the rows selected by a FilterIndex mask."""
+        codes = self.codes if mask is None else self.codes[mask[self.rows]]
+        return np.bincount(codes, minlength=len(self.keywords))
+
+    def complete(self, prefix, limit=50, freqs=None):
+        """Top `limit` keywords starting with `prefix`, most frequent first."""
+        freqs = self.freqs if freqs is None else freqs
+        prefix = prefix.strip().lower()
+
+        lo = bisect_left(self.keywords, prefix)
+        hi = bisect_left(self.keywords, prefix + "\U0010ffff")
+
+        counts = freqs[lo:hi]
+        hits = np.flatnonzero(counts > 0)
+        if len(hits) > limit:
+            hits = hits[np.argpartition(-counts[hits], limit - 1)[:limit]]
+
+        # Frequency descending, ties alphabetical.
+        hits = hits[np.lexsort((hits, -counts[hits]))]
+        return [self.keywords[lo + i] for i in hits]
+
+    def top(self, freqs=None, limit=200):
+        """{keyword: count} of the `limit` most frequent keywords in `freqs`."""
+        freqs = self.freqs if freqs is None else freqs
+        hits = np.flatnonzero(freqs > 0)
+        if len(hits) > limit:
+            hits = hits[np.argpartition(-freqs[hits], limit - 1)[:limit]]
+        return {self.keywords[i]: int(freqs[i]) for i in hits}
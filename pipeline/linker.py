@@ -0,0 +1,247 @@
+"""
+Link registry papers to entries of the local ACL Anthology corpus.
+
+    links = link_registry()          # cached in data/registry_links.csv
+
+Registry DOIs are matched exactly first. Remaining titles go through a
+character-trigram blocking index over normalized corpus titles: each title
+looks up only its rarest trigrams, the corpus titles sharing most of them
+become candidates, and candidates are scored by trigram Jaccard similarity.
+
+Results are cached per corpus fingerprint; later runs only link registry
+papers (normalized title + DOI) that are not in the cache yet.
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pipeline.dedup import BIB_DIR, _shingle_hashes, bib_records, normalize_titles
+from pipeline.registry import load_registry
+from pipeline.timing import timed
+
+BASE_DIR = Path(__file__).parents[1]
+LINKS_PATH = BASE_DIR / "data" / "registry_links.csv"
+
+NGRAM = 3
+BLOCK_GRAMS = 12        # rarest trigrams of a title used for blocking
+MAX_GRAM_DF = 1000      # trigrams in more corpus titles than this are never used
+MAX_CANDIDATES = 10     # candidates per title scored exactly
+MIN_SCORE = 0.6         # trigram Jaccard needed to accept a title match
+QUERY_CHUNK = 500
+
+LINK_COLUMNS = [
+    "paper_id", "title", "title_norm", "doi",
+    "corpus_id", "corpus_source", "corpus_title", "corpus_doi",
+    "score", "method", "corpus_fingerprint",
+]
+
+
+def _normalize_doi(dois):
+    return (
+        pd.Series(dois)
+        .fillna("")
+        .astype(str)
+        .str.lower()
+        .str.strip()
+        .str.replace(r"^https?://(dx\.)?doi\.org/", "", regex=True)
+    )
+
+
+def corpus_fingerprint(bib_dir=BIB_DIR):
+    """Hash of the corpus .bib file names, sizes and mtimes."""
+    h = hashlib.sha1()
+    for path in sorted(Path(bib_dir).glob("*.bib")):
+        stat = path.stat()
+        h.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+def _distinct_grams(norm_titles):
+    """Sorted (title, trigram) pairs, one per distinct trigram of each title."""
+    hashes, counts = _shingle_hashes(list(norm_titles), k=NGRAM)
+    title = np.repeat(np.arange(len(counts)), counts)
+    keys = np.unique((title << 24) | hashes.astype(np.int64))
+    return keys >> 24, keys & 0xFFFFFF
+
+
+class TitleIndex:
+    """
+    Trigram blocking index over normalized corpus titles.
+
+    - `grams` / `gram_titles`: (trigram, title) pairs sorted by trigram, so
+      a trigram's posting list is one searchsorted range
+    - `title_ptr` / `title_grams`: each title's distinct trigrams (CSR)
+    """
+
+    def __init__(self, corpus):
+        self.corpus = corpus.reset_index(drop=True)
+        self.norm = normalize_titles(self.corpus["title"]).to_numpy()
+
+        titles, grams = _distinct_grams(self.norm)
+        self.title_grams = grams
+        self.title_ptr = np.searchsorted(titles, np.arange(len(self.norm) + 1))
+
+        order = np.argsort(grams, kind="stable")
+        self.grams = grams[order]
+        self.gram_titles = titles[order]
+
+    def candidates(self, norm_titles):
+        """(query, corpus title, shared blocking trigrams) for top candidates."""
+        queries, grams = _distinct_grams(norm_titles)
+
+        lo = np.searchsorted(self.grams, grams, side="left")
+        hi = np.searchsorted(self.grams, grams, side="right")
+        df = hi - lo
+
+        usable = (df > 0) & (df <= MAX_GRAM_DF)
+        queries, lo, df = queries[usable], lo[usable], df[usable]
+
+        # Rarest trigrams first within each query, keep BLOCK_GRAMS of them.
+        order = np.lexsort((df, queries))
+        queries, lo, df = queries[order], lo[order], df[order]
+        starts = np.searchsorted(queries, queries, side="left")
+        keep = np.arange(len(queries)) - starts < BLOCK_GRAMS
+        queries, lo, df = queries[keep], lo[keep], df[keep]
+
+        # Expand every posting range into (query, corpus title) pairs.
+        offsets = np.cumsum(df) - df
+        pos = np.arange(df.sum()) - np.repeat(offsets, df) + np.repeat(lo, df)
+        pair_q = np.repeat(queries, df)
+        pair_t = self.gram_titles[pos]
+
+        n = len(self.norm)
+        pairs, shared = np.unique(pair_q * n + pair_t, return_counts=True)
+        pair_q, pair_t = pairs // n, pairs % n
+
+        order = np.lexsort((-shared, pair_q))
+        pair_q, pair_t, shared = pair_q[order], pair_t[order], shared[order]
+        starts = np.searchsorted(pair_q, pair_q, side="left")
+        top = np.arange(len(pair_q)) - starts < MAX_CANDIDATES
+
+        return pair_q[top], pair_t[top], shared[top]
+
+    def _gram_set(self, t):
+        return set(self.title_grams[self.title_ptr[t]:self.title_ptr[t + 1]].tolist())
+
+    def match(self, norm_titles):
+        """Best corpus row and trigram Jaccard score per title (-1 / 0.0 if none)."""
+        best = np.full(len(norm_titles), -1, dtype=np.int64)
+        score = np.zeros(len(norm_titles))
+
+        for start in range(0, len(norm_titles), QUERY_CHUNK):
+            chunk = norm_titles[start:start + QUERY_CHUNK]
+            pair_q, pair_t, _ = self.candidates(chunk)
+
+            q_titles, q_grams = _distinct_grams(chunk)
+            q_ptr = np.searchsorted(q_titles, np.arange(len(chunk) + 1))
+
+            for q, t in zip(pair_q.tolist(), pair_t.tolist()):
+                a = set(q_grams[q_ptr[q]:q_ptr[q + 1]].tolist())
+                b = self._gram_set(t)
+                s = len(a & b) / len(a | b)
+                if s > score[start + q]:
+                    score[start + q] = s
+                    best[start + q] = t
+
+        return best, score
+
+
+def registry_papers(registry=None):
+    """Distinct (paper_id, title, doi) rows of the registry."""
+    reg = registry or load_registry()
+    papers = reg.papers[["paper_id", "title", "input_doi"]].rename(columns={"input_doi": "doi"})
+    papers = papers.assign(
+        title_norm=normalize_titles(papers["title"]).to_numpy(),
+        doi=_normalize_doi(papers["doi"]).to_numpy(),
+    )
+    return papers.drop_duplicates(["paper_id", "title_norm", "doi"]).reset_index(drop=True)
+
+
+def load_links(path=LINKS_PATH):
+    try:
+        return pd.read_csv(path, dtype=str, keep_default_na=False).astype(
+            {"score": float}
+        )
+    except FileNotFoundError:
+        return pd.DataFrame(columns=LINK_COLUMNS)
+
+
+@timed("link_papers")
+def link_papers(papers, corpus, index=None, min_score=MIN_SCORE):
+    """Link `papers` (title_norm, doi) to `corpus` rows: DOI first, then title."""
+    corpus = corpus.reset_index(drop=True)
+    out = papers.copy()
+
+    corpus_doi = _normalize_doi(corpus["doi"])
+    doi_row = pd.Series(np.arange(len(corpus)), index=corpus_doi)
+    doi_row = doi_row[doi_row.index != ""]
+    doi_row = doi_row[~doi_row.index.duplicated()]
+
+    row = out["doi"].map(doi_row).fillna(-1).astype(np.int64).to_numpy()
+    score = np.where(row >= 0, 1.0, 0.0)
+    method = np.where(row >= 0, "doi", "").astype(object)
+
+    todo = np.flatnonzero((row < 0) & (out["title_norm"].to_numpy() != ""))
+    if len(todo):
+        index = index or TitleIndex(corpus)
+        best, best_score = index.match(out["title_norm"].to_numpy()[todo])
+        accepted = best_score >= min_score
+        row[todo[accepted]] = best[accepted]
+        score[todo] = best_score
+        method[todo[accepted]] = "title"
+
+    matched = row >= 0
+    for col, src in [
+        ("corpus_id", "id"), ("corpus_source", "source"),
+        ("corpus_title", "title"), ("corpus_doi", "doi"),
+    ]:
+        values = np.full(len(out), "", dtype=object)
+        values[matched] = corpus[src].fillna("").to_numpy()[row[matched]]
+        out[col] = values
+
+    out["score"] = np.round(score, 4)
+    out["method"] = method
+    return out
+
+
+def link_registry(path=LINKS_PATH, registry=None, bib_dir=BIB_DIR, min_score=MIN_SCORE):
+    """
+    Registry paper -> corpus entry links with confidence scores, written to
+    `path`. Papers already linked against the same corpus are reused.
+    """
+    fingerprint = corpus_fingerprint(bib_dir)
+    papers = registry_papers(registry)
+
+    cached = load_links(path)
+    cached = cached[cached["corpus_fingerprint"] == fingerprint]
+    known = cached.drop_duplicates(["title_norm", "doi"]).set_index(["title_norm", "doi"])
+
+    key = pd.MultiIndex.from_frame(papers[["title_norm", "doi"]])
+    new = papers[~key.isin(known.index)]
+
+    if len(new):
+        corpus = bib_records(sorted(Path(bib_dir).glob("*.bib")))
+        linked = link_papers(new, corpus, min_score=min_score)
+        linked["corpus_fingerprint"] = fingerprint
+        # Empty frames are left out: concatenating them is deprecated in pandas.
+        frames = [f for f in (cached, linked) if len(f)]
+        known = pd.concat(frames, ignore_index=True).drop_duplicates(
+            ["title_norm", "doi"], keep="last"
+        ).set_index(["title_norm", "doi"])
+
+    # Every registry paper (including repeated ids) gets its linked columns.
+    links = papers.join(known.drop(columns=["paper_id", "title"]), on=["title_norm", "doi"])
+    links = links[LINK_COLUMNS]
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    links.to_csv(path, index=False)
+    return links
+
+
+if __name__ == "__main__":
+    links = link_registry()
+    print(links["method"].replace("", "unmatched").value_counts().to_string())
+    print(f"written to {LINKS_PATH}")
@@ -1,16 +1,173 @@
+import importlib.util
+
 import pandas as pd
 
-def load_papers(uploaded_file):
+from pipeline.cleaner import RENAME_MAP
+from pipeline.timing import timed
+
+# Raw and normalized names of every column normalize_columns() consumes.
+# Anything else in an export (LitmapsId, PubMedId, Cited By, ...) is dropped at parse time.
+PAPER_COLUMNS = set(RENAME_MAP) | set(RENAME_MAP.values())
+
+DTYPE_HINTS = {
+    "Title": "object", "title": "object",
+    "Abstract": "object", "abstract": "object",
+    "Tags": "object", "keywords": "object",
+    "Journal": "object", "venue": "object",
+    "Year": "float64", "year": "float64",
+}
+
+CHUNK_SIZE = 50_000
+
+# Checked without importing: pyarrow itself is only loaded when a reader needs it.
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+CSV_EXTENSIONS = (".csv",)
+JSON_EXTENSIONS = (".json",)
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+FEATHER_EXTENSIONS = (".feather", ".arrow", ".ipc")
+
+# For st.file_uploader(type=...)
+SUPPORTED_TYPES = [
+    ext.lstrip(".")
+    for ext in (
+        CSV_EXTENSIONS + JSON_EXTENSIONS + JSONL_EXTENSIONS
+        + PARQUET_EXTENSIONS + FEATHER_EXTENSIONS
+    )
+]
+
+
+def _file_format(uploaded_file):
     name = uploaded_file.name.lower()
 
-    if name.endswith(".csv"):
-        return pd.read_csv(uploaded_file)
+    for fmt, exts in [
+        ("csv", CSV_EXTENSIONS),
+        ("json", JSON_EXTENSIONS),
+        ("jsonl", JSONL_EXTENSIONS),
+        ("parquet", PARQUET_EXTENSIONS),
+        ("feather", FEATHER_EXTENSIONS),
+    ]:
+        if name.endswith(exts):
+            return fmt
+
+    raise ValueError("Unsupported file format")
+
+
+def _require_pyarrow(fmt):
+    if not HAS_PYARROW:
+        raise ImportError(f"pyarrow is required to read {fmt} files")
+
+
+def _csv_header(uploaded_file):
+    header = pd.read_csv(uploaded_file, nrows=0).columns
+    uploaded_file.seek(0)
+    return list(header)
+
+
+def _read_csv_options(uploaded_file, columns):
+    opts = {}
+
+    if columns is not None:
+        usecols = [c for c in _csv_header(uploaded_file) if c in columns]
+        opts["usecols"] = usecols
+        opts["dtype"] = {c: DTYPE_HINTS[c] for c in usecols if c in DTYPE_HINTS}
+
+    return opts
+
+
+def _project(df, columns):
+    if columns is None:
+        return df
+    return df[[c for c in df.columns if c in columns]]
+
+
+def _arrow_to_pandas(table):
+    # split_blocks + self_destruct avoid consolidating columns into a second copy.
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _parquet_file(uploaded_file):
+    _require_pyarrow("Parquet")
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(uploaded_file)
+
+
+def _parquet_columns(pf, columns):
+    if columns is None:
+        return None
+    return [c for c in pf.schema_arrow.names if c in columns]
+
+
+def _read_feather(uploaded_file, columns):
+    _require_pyarrow("Feather/Arrow")
+    import pyarrow.feather as feather
+
+    # Uncompressed Arrow IPC buffers are used in place (zero-copy).
+    table = feather.read_table(uploaded_file, memory_map=False)
+    if columns is not None:
+        table = table.select([c for c in table.column_names if c in columns])
+    return _arrow_to_pandas(table)
+
+
+def iter_papers(uploaded_file, columns=PAPER_COLUMNS, chunksize=CHUNK_SIZE):
+    """
+    Yield the upload as projected DataFrame batches so the cleaners can run
+    batch by batch instead of on one fully materialized frame.
+    """
+    fmt = _file_format(uploaded_file)
+
+    if fmt == "csv":
+        opts = _read_csv_options(uploaded_file, columns)
+        yield from pd.read_csv(uploaded_file, chunksize=chunksize, **opts)
+
+    elif fmt == "jsonl":
+        for chunk in pd.read_json(uploaded_file, lines=True, chunksize=chunksize):
+            yield _project(chunk, columns)
+
+    elif fmt == "parquet":
+        pf = _parquet_file(uploaded_file)
+        for batch in pf.iter_batches(
+            batch_size=chunksize,
+            columns=_parquet_columns(pf, columns)
+        ):
+            yield batch.to_pandas()
+
+    elif fmt == "feather":
+        yield _read_feather(uploaded_file, columns)
+
+    else:
+        yield _project(pd.read_json(uploaded_file), columns)
+
+
+@timed("load_papers")
+def load_papers(uploaded_file, columns=PAPER_COLUMNS, engine=None):
+    """
+    Load an upload, keeping only `columns` (None keeps everything).
+    CSVs use the pyarrow engine when it is installed.
+    """
+    fmt = _file_format(uploaded_file)
+
+    if fmt == "csv":
+        opts = _read_csv_options(uploaded_file, columns)
+        if engine is None and HAS_PYARROW:
+            engine = "pyarrow"
+        return pd.read_csv(uploaded_file, engine=engine, **opts)
+
+    elif fmt == "jsonl":
+        return pd.concat(iter_papers(uploaded_file, columns), ignore_index=True)
+
+    elif fmt == "parquet":
+        pf = _parquet_file(uploaded_file)
+        return _arrow_to_pandas(pf.read(columns=_parquet_columns(pf, columns)))
 
-    elif name.endswith(".json"):
-        return pd.read_json(uploaded_file)
+    elif fmt == "feather":
+        return _read_feather(uploaded_file, columns)
 
     else:
-        raise ValueError("Unsupported file format")
+        return _project(pd.read_json(uploaded_file), columns)
 
 
 # import pandas as pd
@@ -22,4 +179,4 @@ def load_papers(uploaded_file):
 #     elif path.suffix == ".json":
 #         return pd.read_json(path)
 #     else:
-#         raise ValueError("Unsupported file format")
\ No newline at end of file
+#         raise ValueError("Unsupported file format")
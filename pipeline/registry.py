@@ -0,0 +1,293 @@
+"""
+Shared, parsed-once access to data/registry.json for the mapping pages.
+
+    reg = load_registry()
+    reg.papers            # one row per (track, paper) mapping
+    reg.regulatory        # exploded regulatory labels: row, label
+    reg.links             # exploded external links: row, type, url, source
+    reg.paper(paper_id)   # original paper dict
+
+The file is parsed and flattened once per (path, mtime, size); every page
+and every rerun gets the same Registry object until the file changes.
+Once data/registry_store/ (pipeline.registry_store) has been initialized it
+is read instead, cached per store version.
+"""
+
+import json
+from functools import cached_property, lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pipeline.dedup import normalize_titles
+from pipeline.registry_store import MANIFEST, STORE_DIR, read_store, store_version
+
+BASE_DIR = Path(__file__).parents[1]
+REGISTRY_PATH = BASE_DIR / "data" / "registry.json"
+
+PAPER_FIELDS = {
+    "id": "paper_id",
+    "input.title": "title",
+    "input.abstract": "abstract",
+    "input.doi": "input_doi",
+    "method_category": "method",
+    "decision_trace_support": "trace",
+    "relevance_score": "relevance",
+}
+
+
+def _flatten_tracks(tracks):
+    counts = [len(t.get("papers", [])) for t in tracks]
+    track_idx = np.repeat(np.arange(len(tracks)), counts)
+    papers = [p for t in tracks for p in t.get("papers", [])]
+
+    flat = pd.json_normalize(papers, max_level=1) if papers else pd.DataFrame()
+    df = flat.reindex(columns=list(PAPER_FIELDS)).rename(columns=PAPER_FIELDS)
+
+    rq_text = [
+        t.get("meta", {}).get("research_question") or f"RQ_{ti}"
+        for ti, t in enumerate(tracks)
+    ]
+    track_ids = [t.get("id") for t in tracks]
+
+    df.insert(0, "track", track_idx)
+    df.insert(1, "track_id", [track_ids[i] for i in track_idx])
+    df.insert(2, "rq_id", [f"RQ_{i}" for i in track_idx])
+    df.insert(3, "rq", [rq_text[i] for i in track_idx])
+    df["relevance"] = pd.to_numeric(df["relevance"], errors="coerce")
+
+    return df, papers
+
+
+def _explode_regulatory(papers):
+    labels = pd.Series([p.get("regulatory_relevance") or [] for p in papers], dtype=object)
+    exploded = labels.explode().dropna()
+    return pd.DataFrame({"row": exploded.index.to_numpy(), "label": exploded.to_numpy()})
+
+
+def _explode_links(papers):
+    links = pd.Series([p.get("external_links") or [] for p in papers], dtype=object)
+    exploded = links.explode().dropna()
+
+    out = pd.json_normalize(exploded.tolist()).reindex(columns=["type", "url", "source"])
+    out.insert(0, "row", exploded.index.to_numpy())
+    return out
+
+
+def _label_table(long, n, column):
+    """
+    Sorted distinct labels per paper from a (paper, label) long frame:
+    returns (labels, joined strings, n x len(labels) membership bitmap).
+    """
+    long = long.dropna(subset=[column]).drop_duplicates(["paper", column])
+    codes, labels = pd.factorize(long[column], sort=True)
+
+    bitmap = np.zeros((n, len(labels)), dtype=bool)
+    bitmap[long["paper"].to_numpy(), codes] = True
+
+    joined = (
+        long.assign(code=codes)
+        .sort_values(["paper", "code"])
+        .groupby("paper")[column]
+        .agg(", ".join)
+        .reindex(range(n), fill_value="")
+    )
+    return list(labels), joined.to_numpy(), bitmap
+
+
+class UniquePapers:
+    """
+    Mappings merged into one row per normalized title, with one boolean
+    bitmap per multi-label field so filters are column lookups, not regexes.
+    """
+
+    LABEL_FIELDS = ("method", "trace", "regulatory")
+
+    def __init__(self, papers, regulatory):
+        paper, _ = pd.factorize(normalize_titles(papers["title"]), sort=True)
+        n = paper.max() + 1 if len(paper) else 0
+        long = papers.assign(paper=paper)
+
+        firsts = long.groupby("paper")[["title", "paper_id"]].first()
+        table = firsts.reindex(range(n))
+        table["relevance"] = long.groupby("paper")["relevance"].max().fillna(0.0)
+
+        rqs = long[["paper", "rq"]].drop_duplicates().sort_values(["paper", "rq"])
+        table["rq"] = rqs.groupby("paper")["rq"].agg(list)
+        table["rq_count"] = table["rq"].str.len()
+
+        reg_long = pd.DataFrame({
+            "paper": paper[regulatory["row"].to_numpy()],
+            "regulatory": regulatory["label"].to_numpy(),
+        })
+
+        self.labels = {}
+        self.bitmaps = {}
+        for field, frame in [
+            ("method", long[["paper", "method"]]),
+            ("trace", long[["paper", "trace"]]),
+            ("regulatory", reg_long),
+        ]:
+            self.labels[field], table[field], self.bitmaps[field] = _label_table(frame, n, field)
+
+        self.table = table.reset_index(drop=True)
+
+    def label_mask(self, field, selected):
+        """Rows carrying at least one of the `selected` labels of `field`."""
+        index = {label: i for i, label in enumerate(self.labels[field])}
+        codes = [index[s] for s in selected if s in index]
+        return self.bitmaps[field][:, codes].any(axis=1)
+
+
+def _cube_cells(long, keys):
+    cells = (
+        long.groupby(keys)
+        .agg(count=("relevance", "size"), max_relevance=("relevance", "max"))
+        .reset_index()
+    )
+    return {c: cells[c].to_numpy() for c in cells.columns}
+
+
+class FacetCube:
+    """
+    Mapping counts and max relevance per (rq, method, trace, relevance
+    bucket), plus the same cube split by regulatory label. Facet counts and
+    filtered totals are sums over the matching cells, so they cost the
+    number of distinct combinations, not the number of mappings.
+
+    Filters are lists of selected values (None = unfiltered); relevance is
+    bucketed in steps of 0.01 to answer the sidebar slider exactly.
+    """
+
+    DIMS = ("rq", "method", "trace")
+    RELEVANCE_STEPS = 100
+
+    def __init__(self, papers, regulatory):
+        self.values = {}
+        long = pd.DataFrame({"relevance": papers["relevance"].to_numpy()})
+
+        for dim in self.DIMS:
+            codes, values = pd.factorize(papers[dim], sort=True)
+            long[dim] = codes
+            self.values[dim] = list(values)
+
+        relevance = papers["relevance"].fillna(0.0).clip(0.0, 1.0).to_numpy()
+        long["bucket"] = np.floor(relevance * self.RELEVANCE_STEPS + 1e-9).astype(np.int64)
+
+        keys = list(self.DIMS) + ["bucket"]
+        self.cells = _cube_cells(long, keys)
+
+        label_codes, labels = pd.factorize(regulatory["label"], sort=True)
+        self.values["regulatory"] = list(labels)
+        by_label = long.iloc[regulatory["row"].to_numpy()].assign(regulatory=label_codes)
+        self.label_cells = _cube_cells(by_label, keys + ["regulatory"])
+
+    def _mask(self, cells, filters, min_relevance, exclude=None):
+        mask = cells["bucket"] >= round(min_relevance * self.RELEVANCE_STEPS)
+        for dim, selected in filters.items():
+            if dim == exclude or selected is None:
+                continue
+            index = {v: i for i, v in enumerate(self.values[dim])}
+            mask &= np.isin(cells[dim], [index[v] for v in selected if v in index])
+        return mask
+
+    def facet_counts(self, dim, min_relevance=0.0, **filters):
+        """
+        {value: mappings} for one dimension under every filter except its
+        own, so unselected options still show what selecting them would add.
+        """
+        cells = self.label_cells if dim == "regulatory" or "regulatory" in filters else self.cells
+        mask = self._mask(cells, filters, min_relevance, exclude=dim) & (cells[dim] >= 0)
+
+        counts = np.bincount(
+            cells[dim][mask],
+            weights=cells["count"][mask],
+            minlength=len(self.values[dim]),
+        )
+        return {v: int(c) for v, c in zip(self.values[dim], counts)}
+
+    def summary(self, min_relevance=0.0, **filters):
+        """(mappings, max relevance) of the slice over rq/method/trace."""
+        mask = self._mask(self.cells, filters, min_relevance)
+        if not mask.any():
+            return 0, None
+        max_relevance = pd.Series(self.cells["max_relevance"][mask]).max()
+        return int(self.cells["count"][mask].sum()), max_relevance
+
+
+class Registry:
+    """Flattened views over one parsed registry.json."""
+
+    def __init__(self, raw, version=None):
+        self.raw = raw
+        self.version = version
+        self.tracks = raw.get("research_tracks", [])
+
+        self.papers, paper_dicts = _flatten_tracks(self.tracks)
+        self.regulatory = _explode_regulatory(paper_dicts)
+        self.links = _explode_links(paper_dicts)
+
+        joined = self.regulatory.groupby("row")["label"].agg(", ".join)
+        self.papers["regulatory"] = joined.reindex(self.papers.index, fill_value="")
+
+        first_link = self.links.drop_duplicates(["row", "type"]).pivot(
+            index="row", columns="type", values="url"
+        )
+        for link_type in ("doi", "pdf"):
+            urls = first_link[link_type] if link_type in first_link else pd.Series(dtype=object)
+            self.papers[link_type] = urls.reindex(self.papers.index).fillna("")
+
+        # Last mapping of an id wins, as with the pages' former paper_lookup dicts.
+        self._by_id = {p.get("id"): p for p in paper_dicts}
+
+    def paper(self, paper_id):
+        return self._by_id[paper_id]
+
+    @property
+    def paper_lookup(self):
+        return self._by_id
+
+    @cached_property
+    def unique(self):
+        """UniquePapers, built on first use and kept for this registry version."""
+        return UniquePapers(self.papers, self.regulatory)
+
+    @cached_property
+    def cube(self):
+        """FacetCube, built on first use and kept for this registry version."""
+        return FacetCube(self.papers, self.regulatory)
+
+    def track_papers(self, track):
+        """Mapping rows of one track (by position in research_tracks)."""
+        return self.papers[self.papers["track"] == track]
+
+
+def registry_path():
+    """The segmented store once it has a manifest, else registry.json."""
+    return STORE_DIR if (STORE_DIR / MANIFEST).exists() else REGISTRY_PATH
+
+
+@lru_cache(maxsize=4)
+def _load(path, mtime_ns, size):
+    with open(path, "r", encoding="utf-8") as f:
+        return Registry(json.load(f), version=f"{path}:{mtime_ns}:{size}")
+
+
+@lru_cache(maxsize=4)
+def _load_store(store, version):
+    return Registry(read_store(store), version=f"{store}:{version}")
+
+
+def load_registry(path=None):
+    """
+    Parsed registry, re-read only when the file's mtime or size changes
+    (or, for a store directory, when a segment lands or it is compacted).
+    """
+    path = Path(path or registry_path())
+
+    if path.is_dir():
+        return _load_store(str(path), store_version(path))
+
+    stat = path.stat()
+    return _load(str(path), stat.st_mtime_ns, stat.st_size)
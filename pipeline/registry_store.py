@@ -0,0 +1,378 @@
+"""
+Append-only, segmented storage for the research registry.
+
+    data/registry_store/
+        manifest.json              current snapshot + segments folded into it
+        snapshot-<ns>.jsonl        compacted records
+        segments/<ns>-<uuid>.jsonl one ingest each (a track and its papers),
+                                   named when it lands, not when it starts
+
+Every line is one record:
+
+    {"type": "track", "track_id": ..., "meta": {...}}
+    {"type": "paper", "track_id": ..., "paper": {...}}
+
+Ingesting a NotebookLM result ({meta, papers}) writes one new segment, so
+it costs O(track) and never rewrites existing files; concurrent writers
+only ever create distinct files. Readers see snapshot + live segments,
+replayed in order (later records win). compact() folds segments into a
+new snapshot under a lock file and swaps the manifest atomically.
+
+    python -m pipeline.registry_store import data/registry.json
+    python -m pipeline.registry_store ingest results/*.json --workers 8
+    python -m pipeline.registry_store compact
+    python -m pipeline.registry_store export data/registry.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from pipeline.schema import check_document, validate_files
+
+BASE_DIR = Path(__file__).parents[1]
+STORE_DIR = BASE_DIR / "data" / "registry_store"
+
+MANIFEST = "manifest.json"
+SEGMENT_DIR = "segments"
+LOCK_FILE = "compact.lock"
+
+COMPACT_AFTER_SEGMENTS = 32
+# A held lock is touched every LOCK_HEARTBEAT_SECONDS; one untouched for
+# STALE_LOCK_SECONDS belongs to a compaction that died.
+STALE_LOCK_SECONDS = 300
+LOCK_HEARTBEAT_SECONDS = 30
+
+
+# ================================
+# FILES
+# ================================
+
+def _now_ns():
+    return f"{time.time_ns():020d}"
+
+
+def _write_temp(directory, lines):
+    """Write lines to a hidden temp file in `directory`, synced to disk."""
+    tmp = directory / f".{uuid.uuid4().hex}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(line + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp
+
+
+def _write_atomic(path, lines):
+    """Write to a temp file in the same directory, then rename into place."""
+    os.replace(_write_temp(path.parent, lines), path)
+
+
+def _read_manifest(store):
+    try:
+        with open(store / MANIFEST, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"snapshot": None, "compacted": []}
+
+
+def _read_records(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def live_segments(store=STORE_DIR, manifest=None):
+    """Segment files not yet folded into the snapshot, in ingest order."""
+    store = Path(store)
+    manifest = manifest or _read_manifest(store)
+    compacted = set(manifest.get("compacted", []))
+    return [
+        p for p in sorted((store / SEGMENT_DIR).glob("*.jsonl"))
+        if p.name not in compacted
+    ]
+
+
+def store_version(store=STORE_DIR):
+    """Cheap cache key: changes whenever a segment lands or a compaction runs."""
+    store = Path(store)
+    try:
+        manifest_mtime = (store / MANIFEST).stat().st_mtime_ns
+    except FileNotFoundError:
+        manifest_mtime = 0
+    return manifest_mtime, tuple(p.name for p in live_segments(store))
+
+
+# ================================
+# RECORDS <-> REGISTRY
+# ================================
+
+def track_id(item):
+    """Explicit track id, else a stable hash of the research question."""
+    if item.get("id"):
+        return item["id"]
+    rq = item.get("meta", {}).get("research_question", "")
+    return "rq_" + hashlib.sha1(rq.encode("utf-8")).hexdigest()[:12]
+
+
+def paper_key(paper):
+    """Explicit paper id, else a stable hash of its normalized title and DOI."""
+    if paper.get("id"):
+        return paper["id"]
+    inp = paper.get("input") or {}
+    title = " ".join(str(inp.get("title") or "").lower().split())
+    doi = str(inp.get("doi") or "").strip().lower()
+    return "_" + hashlib.sha1(f"{title}\n{doi}".encode("utf-8")).hexdigest()[:12]
+
+
+def track_records(item):
+    tid = track_id(item)
+    yield {"type": "track", "track_id": tid, "meta": item.get("meta", {})}
+    for paper in item.get("papers", []):
+        yield {"type": "paper", "track_id": tid, "paper": paper}
+
+
+def _replay(records, tracks=None):
+    """Fold records into {track_id: {"id", "meta", "papers": {paper_id: paper}}}."""
+    tracks = {} if tracks is None else tracks
+
+    for r in records:
+        track = tracks.setdefault(r["track_id"], {"id": r["track_id"], "meta": {}, "papers": {}})
+        if r["type"] == "track":
+            track["meta"] = r["meta"]
+        elif r["type"] == "paper":
+            papers = track["papers"]
+            key = paper_key(r["paper"])
+            papers.pop(key, None)
+            papers[key] = r["paper"]
+
+    return tracks
+
+
+def _to_registry(tracks):
+    return {
+        "research_tracks": [
+            {"id": t["id"], "meta": t["meta"], "papers": list(t["papers"].values())}
+            for t in tracks.values()
+        ]
+    }
+
+
+def _iter_store(store, manifest, segments):
+    if manifest.get("snapshot"):
+        yield from _read_records(store / manifest["snapshot"])
+    for path in segments:
+        yield from _read_records(path)
+
+
+def read_store(store=STORE_DIR, retries=5):
+    """
+    The union of snapshot and live segments as a registry.json-shaped dict.
+    Retries if a compaction swapped the manifest while reading.
+    """
+    store = Path(store)
+
+    for _ in range(retries):
+        manifest = _read_manifest(store)
+        segments = live_segments(store, manifest)
+        try:
+            tracks = _replay(_iter_store(store, manifest, segments))
+        except FileNotFoundError:
+            continue
+        if _read_manifest(store) == manifest:
+            return _to_registry(tracks)
+
+    raise RuntimeError(f"registry store at {store} kept changing while reading")
+
+
+# ================================
+# WRITES
+# ================================
+
+def ingest(items, store=STORE_DIR, compact_after=COMPACT_AFTER_SEGMENTS, validate=True):
+    """
+    Append NotebookLM results ({meta, papers} or a list of them) as one new
+    segment. Returns the segment path.
+
+    Results are schema-checked and coerced first (pipeline.schema); a bad
+    result raises SchemaError and nothing is written.
+    """
+    store = Path(store)
+    if validate:
+        items = check_document(items)
+    elif isinstance(items, dict):
+        items = items.get("research_tracks", [items])
+
+    seg_dir = store / SEGMENT_DIR
+    seg_dir.mkdir(parents=True, exist_ok=True)
+
+    tmp = _write_temp(seg_dir, (
+        json.dumps(r, ensure_ascii=False)
+        for item in items
+        for r in track_records(item)
+    ))
+    # The replay order (file name) is taken only once the data is written,
+    # so a slow writer cannot land behind newer segments that a compaction
+    # has already folded into the snapshot.
+    path = seg_dir / f"{_now_ns()}-{uuid.uuid4().hex[:8]}.jsonl"
+    os.replace(tmp, path)
+
+    if compact_after and len(live_segments(store)) >= compact_after:
+        compact_in_background(store)
+
+    return path
+
+
+@contextmanager
+def _compaction_lock(store, timeout=30.0):
+    path = store / LOCK_FILE
+    deadline = time.monotonic() + timeout
+
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - path.stat().st_mtime > STALE_LOCK_SECONDS:
+                    path.unlink()
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"registry store is locked: {path}")
+            time.sleep(0.05)
+
+    os.write(fd, str(os.getpid()).encode())
+    released = threading.Event()
+
+    def heartbeat():
+        # Long compactions keep the lock fresh so it is never taken as stale.
+        while not released.wait(LOCK_HEARTBEAT_SECONDS):
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                return
+
+    beat = threading.Thread(target=heartbeat, name="registry-lock-heartbeat", daemon=True)
+    beat.start()
+    try:
+        yield
+    finally:
+        released.set()
+        beat.join()
+        os.close(fd)
+        path.unlink(missing_ok=True)
+
+
+def compact(store=STORE_DIR, timeout=30.0):
+    """
+    Fold snapshot + live segments into a new snapshot. Segments written
+    while compacting stay live and are picked up by the next compaction.
+    Returns the number of segments folded.
+    """
+    store = Path(store)
+    store.mkdir(parents=True, exist_ok=True)
+
+    with _compaction_lock(store, timeout=timeout):
+        manifest = _read_manifest(store)
+        segments = live_segments(store, manifest)
+        if not segments:
+            return 0
+
+        tracks = _replay(_iter_store(store, manifest, segments))
+
+        snapshot = store / f"snapshot-{_now_ns()}.jsonl"
+        _write_atomic(snapshot, (
+            json.dumps(r, ensure_ascii=False)
+            for item in _to_registry(tracks)["research_tracks"]
+            for r in track_records(item)
+        ))
+
+        # Keep names of folded segments that could not be deleted yet.
+        folded = [p.name for p in segments]
+        _write_atomic(store / MANIFEST, [json.dumps({
+            "snapshot": snapshot.name,
+            "compacted": [
+                name for name in manifest.get("compacted", []) + folded
+                if (store / SEGMENT_DIR / name).exists()
+            ],
+            "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }, indent=2)])
+
+        if manifest.get("snapshot"):
+            (store / manifest["snapshot"]).unlink(missing_ok=True)
+        for path in segments:
+            path.unlink(missing_ok=True)
+
+    return len(segments)
+
+
+def compact_in_background(store=STORE_DIR):
+    """Compact in a daemon thread; skipped if another compaction holds the lock."""
+    def run():
+        try:
+            compact(store, timeout=0)
+        except TimeoutError:
+            pass
+
+    thread = threading.Thread(target=run, name="registry-compaction", daemon=True)
+    thread.start()
+    return thread
+
+
+def import_registry(path, store=STORE_DIR):
+    """Seed the store from an existing registry.json and compact it."""
+    with open(path, "r", encoding="utf-8") as f:
+        registry = json.load(f)
+    ingest(registry.get("research_tracks", []), store=store, compact_after=0, validate=False)
+    compact(store)
+
+
+def export_registry(path, store=STORE_DIR):
+    """Write the store's union back out as a registry.json."""
+    path = Path(path)
+    _write_atomic(path, [json.dumps(read_store(store), indent=2, ensure_ascii=False)])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Segmented registry store")
+    parser.add_argument("--store", default=str(STORE_DIR))
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("import", help="seed from a registry.json").add_argument("path")
+    ingest_parser = sub.add_parser("ingest", help="append NotebookLM result JSON files")
+    ingest_parser.add_argument("paths", nargs="+")
+    ingest_parser.add_argument("--workers", type=int, default=None)
+    sub.add_parser("compact", help="fold segments into a new snapshot")
+    sub.add_parser("export", help="write the union as registry.json").add_argument("path")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        import_registry(args.path, store=args.store)
+    elif args.command == "ingest":
+        # Validate every file in parallel first; only clean files are appended.
+        for result in validate_files(args.paths, workers=args.workers):
+            if result["errors"]:
+                print(f"skipped {result['path']}:")
+                for path, message in result["errors"]:
+                    print(f"    {path}: {message}")
+                continue
+            print(ingest(result["items"], store=args.store, compact_after=0, validate=False))
+    elif args.command == "compact":
+        print(f"folded {compact(args.store)} segment(s)")
+    elif args.command == "export":
+        export_registry(args.path, store=args.store)
+
+
+if __name__ == "__main__":
+    main()
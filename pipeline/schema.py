@@ -0,0 +1,331 @@
+"""
+Validation of NotebookLM JSON results ({meta, papers}) before they reach
+the registry.
+
+The output schema requested by pages/0_prompt.py is written below as a
+small JSON-Schema subset and compiled once, at import, into nested checker
+closures. Checking a document is then one pass with no schema lookups.
+Checkers coerce where the intent is clear ("0.8" -> 0.8, "neuro symbolic"
+-> "Neuro-symbolic", "Neural | Symbolic" -> "Hybrid", a lone string ->
+[string], null lists -> []) and report everything else as (json path,
+message) errors.
+
+    items, errors = validate_document(json.load(f))
+    results = validate_files(paths, workers=8)
+
+    python -m pipeline.schema results/*.json --workers 8
+    python -m pipeline.schema          # the shipped data/registry.json
+"""
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+_MISSING = object()
+_ENUM_KEY_RE = re.compile(r"[^a-z0-9]+")
+# "-" is not a separator: it is part of "Neuro-symbolic".
+_ENUM_SPLIT_RE = re.compile(r"\s*[|,/;&+]\s*")
+
+_STRING = {"type": "string"}
+_STRING_LIST = {"type": "array", "items": _STRING, "default": []}
+
+RESULT_SCHEMA = {
+    "type": "object",
+    "required": ["meta", "papers"],
+    "properties": {
+        "id": _STRING,
+        "meta": {
+            "type": "object",
+            "required": ["research_question"],
+            "properties": {
+                "research_question": {"type": "string", "minLength": 1},
+                "generated_at": _STRING,
+                "notes": _STRING,
+            },
+        },
+        "papers": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["id", "input", "relevance_score", "method_category"],
+                "properties": {
+                    "id": {"type": "string", "minLength": 1},
+                    "input": {
+                        "type": "object",
+                        "required": ["title"],
+                        "properties": {
+                            "title": {"type": "string", "minLength": 1},
+                            "doi": _STRING,
+                            "abstract": _STRING,
+                        },
+                    },
+                    "relevance_score": {"type": "number", "minimum": 0.0, "maximum": 1.0},
+                    "method_category": {
+                        "type": "string",
+                        "enum": ["Neural", "Symbolic", "Neuro-symbolic", "Hybrid"],
+                        # The prompt lists the options as "Neural | Symbolic | ...",
+                        # and results echo combinations in that form.
+                        "combined": "Hybrid",
+                    },
+                    "interpretability_mechanisms": _STRING_LIST,
+                    "regulatory_relevance": _STRING_LIST,
+                    "external_links": {
+                        "type": "array",
+                        "default": [],
+                        "items": {
+                            "type": "object",
+                            "required": ["type", "url"],
+                            "properties": {
+                                "type": {
+                                    "type": "string",
+                                    "enum": ["doi", "publisher", "semantic_scholar", "pdf", "arxiv", "bib", "other"],
+                                },
+                                "url": {"type": "string", "minLength": 1},
+                                "source": _STRING,
+                            },
+                        },
+                    },
+                    "key_contributions": _STRING_LIST,
+                    "decision_trace_support": {
+                        "type": "string",
+                        "enum": ["none", "partial", "strong"],
+                        "default": "none",
+                    },
+                    "suggested_citations": {
+                        "type": "array",
+                        "default": [],
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "title": _STRING,
+                                "reason": _STRING,
+                                "link": _STRING,
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+
+class SchemaError(ValueError):
+    """Raised with the full list of (path, message) errors of a document."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        preview = "; ".join(f"{p}: {m}" for p, m in errors[:5])
+        more = f" (+{len(errors) - 5} more)" if len(errors) > 5 else ""
+        super().__init__(f"{len(errors)} schema error(s): {preview}{more}")
+
+
+# ================================
+# COMPILER
+# ================================
+
+def _enum_key(value):
+    return _ENUM_KEY_RE.sub("", value.lower())
+
+
+def _compile_string(schema):
+    min_length = schema.get("minLength", 0)
+    choices = schema.get("enum")
+    canonical = {_enum_key(c): c for c in choices} if choices else None
+    combined = schema.get("combined")
+
+    def lookup(value):
+        if _enum_key(value) in canonical:
+            return canonical[_enum_key(value)]
+        if combined is None:
+            return None
+        # "A | B": each part must be a choice; one distinct part is that choice.
+        parts = {canonical.get(_enum_key(p)) for p in _ENUM_SPLIT_RE.split(value) if p}
+        if not parts or None in parts:
+            return None
+        return parts.pop() if len(parts) == 1 else combined
+
+    def check(value, path, errors):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = str(value)
+        if not isinstance(value, str):
+            errors.append((path, f"expected string, got {type(value).__name__}"))
+            return value
+
+        value = value.strip()
+        if len(value) < min_length:
+            errors.append((path, "must not be empty"))
+        if canonical is not None:
+            choice = lookup(value)
+            if choice is None:
+                errors.append((path, f"{value!r} is not one of {choices}"))
+                return value
+            value = choice
+        return value
+
+    return check
+
+
+def _compile_number(schema):
+    lo = schema.get("minimum", float("-inf"))
+    hi = schema.get("maximum", float("inf"))
+
+    def check(value, path, errors):
+        if isinstance(value, str):
+            try:
+                value = float(value.strip())
+            except ValueError:
+                errors.append((path, f"expected number, got {value!r}"))
+                return value
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            errors.append((path, f"expected number, got {type(value).__name__}"))
+            return value
+
+        value = float(value)
+        if not lo <= value <= hi:
+            errors.append((path, f"{value} is outside [{lo}, {hi}]"))
+        return value
+
+    return check
+
+
+def _compile_array(schema):
+    item = compile_schema(schema.get("items", {}))
+
+    def check(value, path, errors):
+        if isinstance(value, (str, dict)):
+            value = [value]
+        if not isinstance(value, list):
+            errors.append((path, f"expected array, got {type(value).__name__}"))
+            return value
+        return [item(v, f"{path}[{i}]", errors) for i, v in enumerate(value)]
+
+    return check
+
+
+def _compile_object(schema):
+    fields = [
+        (name, compile_schema(sub), name in schema.get("required", ()), sub.get("default", _MISSING))
+        for name, sub in schema.get("properties", {}).items()
+    ]
+
+    def check(value, path, errors):
+        if not isinstance(value, dict):
+            errors.append((path, f"expected object, got {type(value).__name__}"))
+            return value
+
+        out = dict(value)
+        for name, field, required, default in fields:
+            v = value.get(name, _MISSING)
+            if v is _MISSING or v is None:
+                if required:
+                    errors.append((f"{path}.{name}", "required field is missing"))
+                elif default is not _MISSING:
+                    out[name] = list(default) if isinstance(default, list) else default
+                continue
+            out[name] = field(v, f"{path}.{name}", errors)
+        return out
+
+    return check
+
+
+_COMPILERS = {
+    "string": _compile_string,
+    "number": _compile_number,
+    "array": _compile_array,
+    "object": _compile_object,
+}
+
+
+def compile_schema(schema):
+    """Compile a JSON-Schema subset into a check(value, path, errors) closure."""
+    compiler = _COMPILERS.get(schema.get("type"))
+    if compiler is None:
+        return lambda value, path, errors: value
+    return compiler(schema)
+
+
+validate_result = compile_schema(RESULT_SCHEMA)
+
+
+# ================================
+# DOCUMENTS / FILES
+# ================================
+
+def validate_document(doc):
+    """
+    Validate one parsed file: a {meta, papers} result, a list of them, or a
+    registry-shaped {"research_tracks": [...]}. Returns (coerced items, errors).
+    """
+    if isinstance(doc, dict) and "research_tracks" in doc:
+        items, paths = doc["research_tracks"], "$.research_tracks[{}]"
+    elif isinstance(doc, list):
+        items, paths = doc, "$[{}]"
+    else:
+        items, paths = [doc], "$"
+
+    errors = []
+    coerced = [
+        validate_result(item, paths.format(i), errors)
+        for i, item in enumerate(items)
+    ]
+    return coerced, errors
+
+
+def check_document(doc):
+    """Coerced items of `doc`, or SchemaError listing every problem."""
+    items, errors = validate_document(doc)
+    if errors:
+        raise SchemaError(errors)
+    return items
+
+
+def validate_file(path):
+    """{"path", "items", "errors"} for one JSON file."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            doc = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        return {"path": str(path), "items": [], "errors": [("$", f"unreadable JSON: {e}")]}
+
+    items, errors = validate_document(doc)
+    return {"path": str(path), "items": items, "errors": errors}
+
+
+def validate_files(paths, workers=None):
+    """Validate many files in parallel processes, in input order."""
+    paths = [str(p) for p in paths]
+    if len(paths) <= 1 or workers == 1:
+        return [validate_file(p) for p in paths]
+
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(validate_file, paths, chunksize=max(1, len(paths) // (workers * 4))))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate NotebookLM result JSON files")
+    parser.add_argument("paths", nargs="*", help="default: the shipped data/registry.json")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    if not args.paths:
+        from pipeline.registry import REGISTRY_PATH
+        args.paths = [REGISTRY_PATH]
+
+    n_bad = 0
+    for result in validate_files(args.paths, workers=args.workers):
+        if result["errors"]:
+            n_bad += 1
+            print(f"✗ {result['path']}")
+            for path, message in result["errors"]:
+                print(f"    {path}: {message}")
+        else:
+            print(f"✓ {result['path']} ({len(result['items'])} track(s))")
+
+    raise SystemExit(1 if n_bad else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Lightweight stage timing spans.
+
+    start_run("app")
+    with span("filter", rows=len(df)) as s:
+        ...
+        s["rows_out"] = len(df_f)
+    write_run()     # also before st.stop(), which ends the script early
+
+Functions can be wrapped with @timed("stage"). Spans are only collected
+while a run is active (per script run / thread via contextvars), so library
+code stays free when called from the CLI or benchmarks.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parents[1]
+METRICS_PATH = BASE_DIR / "logs" / "stage_timings.jsonl"
+# Past this size the log is moved to stage_timings.jsonl.1 (replacing the
+# previous one) and a new file is started.
+METRICS_MAX_BYTES = 5 * 1024 * 1024
+
+_run = contextvars.ContextVar("timing_run", default=None)
+_depth = contextvars.ContextVar("timing_depth", default=0)
+
+
+def start_run(name):
+    """Begin collecting spans for one script run."""
+    run = {
+        "run_id": uuid.uuid4().hex[:12],
+        "name": name,
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "spans": [],
+        "t0": time.perf_counter(),
+    }
+    _run.set(run)
+    return run
+
+
+def current_spans():
+    run = _run.get()
+    return list(run["spans"]) if run else []
+
+
+def _rows_of(obj):
+    if isinstance(obj, tuple) and obj:
+        obj = obj[0]
+    if isinstance(obj, (str, bytes)):
+        return None
+    try:
+        return len(obj)
+    except TypeError:
+        return None
+
+
+@contextmanager
+def span(stage, rows=None):
+    """
+    Time a block. The yielded dict can be updated (e.g. with "rows_out")
+    before the block ends.
+    """
+    run = _run.get()
+    if run is None:
+        yield {}
+        return
+
+    start = time.perf_counter()
+    record = {
+        "stage": stage,
+        "rows": rows,
+        "depth": _depth.get(),
+        "offset": round(start - run["t0"], 6),
+    }
+    token = _depth.set(record["depth"] + 1)
+    try:
+        yield record
+    finally:
+        record["seconds"] = round(time.perf_counter() - start, 6)
+        _depth.reset(token)
+        run["spans"].append(record)
+
+
+def timed(stage=None):
+    """Decorator form of span(); rows default to len() of the first argument."""
+    def decorator(fn):
+        name = stage or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _run.get() is None:
+                return fn(*args, **kwargs)
+
+            rows = _rows_of(args[0]) if args else None
+            with span(name, rows=rows) as record:
+                result = fn(*args, **kwargs)
+                record["rows_out"] = _rows_of(result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _rotate(path, max_bytes):
+    try:
+        if path.stat().st_size > max_bytes:
+            os.replace(path, path.with_name(path.name + ".1"))
+    except FileNotFoundError:
+        pass
+
+
+def write_run(path=METRICS_PATH, max_bytes=METRICS_MAX_BYTES):
+    """Append the active run's spans to the JSONL metrics file."""
+    run = _run.get()
+    if run is None or not run["spans"]:
+        return
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _rotate(path, max_bytes)
+
+    with open(path, "a", encoding="utf-8") as f:
+        for record in run["spans"]:
+            f.write(json.dumps({
+                "run_id": run["run_id"],
+                "name": run["name"],
+                "started_at": run["started_at"],
+                **record,
+            }, default=str) + "\n")
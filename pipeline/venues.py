@@ -0,0 +1,69 @@
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parents[1]
+VENUE_DIR = BASE_DIR / "data" / "acl_anthology_venue"
+
+_JOURNAL_NAME_RE = re.compile(r"journal|transactions", re.IGNORECASE)
+_VOLUME_RE = re.compile(r"\bvolume \d+", re.IGNORECASE)
+
+
+def _classify_venue(name, volume_titles):
+    """
+    ACL Anthology venues publishing "Proceedings" are conferences;
+    venues whose volumes are only numbered volumes/issues are journals.
+    """
+    if _JOURNAL_NAME_RE.search(name):
+        return "journal"
+
+    if any("proceedings" in t.lower() for t in volume_titles):
+        return "conference"
+
+    if any(_VOLUME_RE.search(t) for t in volume_titles):
+        return "journal"
+
+    return "conference"
+
+
+@lru_cache(maxsize=4)
+def build_venue_type_map(venue_dir=VENUE_DIR):
+    """
+    Build a lowercase venue -> source_type dictionary from the
+    data/acl_anthology_venue/<venue>/extracted.json scrapes.
+
+    Keys include the venue name, acronym, venue id and every volume title.
+    """
+    venue_types = {}
+
+    for path in sorted(Path(venue_dir).glob("*/extracted.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+
+        name = data.get("title", "").replace(" - ACL Anthology", "").strip()
+        text = data.get("text", "")
+        links = data.get("links", {})
+
+        volume_titles = [
+            title for title, url in links.items()
+            if isinstance(url, str) and url.startswith("/volumes/")
+        ]
+
+        source_type = _classify_venue(name, volume_titles)
+
+        keys = [name, path.parent.name] + volume_titles
+        for label in ("Acronym", "Venue ID"):
+            m = re.search(rf"{label}:\n(.+)\n", text)
+            if m:
+                keys.append(m.group(1))
+
+        for key in keys:
+            key = key.strip().lower()
+            if key:
+                venue_types.setdefault(key, source_type)
+
+    return venue_types
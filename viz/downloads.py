@@ -0,0 +1,54 @@
+"""
+Download buttons whose payload is only built when asked for.
+
+    lazy_download("registry.json", "registry", reg.version, write_json(raw),
+                  file_name="registry.json", mime="application/json", key="explorer_export")
+
+Until an export exists for the current data version the page shows a
+"Prepare" button instead; the file is then streamed to disk once
+(pipeline.exports) and served from there on every later rerun.
+"""
+
+from pathlib import Path
+
+from pipeline.exports import cached_export, export_file
+
+
+def _open_export(path):
+    """Open a built export, or None if it is missing or was pruned meanwhile."""
+    if path is None:
+        return None
+    try:
+        return open(path, "rb")
+    except FileNotFoundError:
+        return None
+
+
+def lazy_download(label, name, version, writer, file_name, mime, key, allow_compress=False):
+    import streamlit as st
+
+    compress = allow_compress and st.checkbox(
+        "gzip", key=f"{key}_gzip", help="Compress the download"
+    )
+    suffix = "".join(Path(file_name).suffixes)
+
+    # Another session's export may prune the file between lookup and open;
+    # that is handled like an export that was never built.
+    f = _open_export(cached_export(name, version, suffix, compress=compress))
+    if f is None:
+        if not st.button(f"Prepare {label}", key=f"{key}_prepare"):
+            return
+        with st.spinner(f"Writing {file_name}…"):
+            f = _open_export(export_file(name, version, writer, suffix, compress=compress))
+        if f is None:
+            st.warning(f"{file_name} was replaced by a newer export; prepare it again.")
+            return
+
+    with f:
+        st.download_button(
+            f"⬇️ Download {label}",
+            data=f,
+            file_name=file_name + (".gz" if compress else ""),
+            mime="application/gzip" if compress else mime,
+            key=f"{key}_download",
+        )
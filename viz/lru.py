@@ -0,0 +1,47 @@
+"""
+Small thread-safe LRU cache for rendered figures, HTML and sort orders.
+
+    _HTML_CACHE = LRUCache(16)
+    html = _HTML_CACHE.get(key)
+    if html is None:
+        html = _HTML_CACHE.put(key, render(...))
+
+Streamlit runs every session in its own thread against the same module
+globals, so lookups, inserts and evictions all happen under one lock.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Mapping of at most `maxsize` entries; the least recently used goes first."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def put(self, key, value):
+        """Store `value` under `key` and return it."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
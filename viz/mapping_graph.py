@@ -0,0 +1,157 @@
+import hashlib
+import math
+
+import pandas as pd
+
+from pipeline.timing import timed
+from viz.lru import LRUCache
+from viz.network import link_local_assets
+
+# Paper nodes drawn before the rest of each RQ collapses into a "+N papers" node.
+MAX_PAPER_NODES = 300
+
+COL_WIDTH = 280
+ROW_HEIGHT = 60
+RQ_X = -500
+
+# Rendered HTML keyed by a hash of the edge set and render parameters.
+HTML_CACHE_SIZE = 16
+_HTML_CACHE = LRUCache(HTML_CACHE_SIZE)
+
+
+def _edge_key(edges, max_papers):
+    cols = (
+        edges[["rq", "paper_id", "title", "relevance"]]
+        .astype(str)
+        .sort_values(["rq", "paper_id"])
+    )
+    digest = pd.util.hash_pandas_object(cols, index=False).to_numpy().tobytes()
+    return hashlib.sha1(digest + str(max_papers).encode()).hexdigest()
+
+
+def budget_edges(edges, max_papers=MAX_PAPER_NODES):
+    """
+    Keep the most relevant papers of each RQ within the node budget.
+    Returns (kept edges, papers hidden per RQ).
+    """
+    edges = edges.drop_duplicates(["rq", "paper_id"])
+    n_rq = edges["rq"].nunique()
+
+    if edges["paper_id"].nunique() <= max_papers or n_rq == 0:
+        return edges, pd.Series(dtype=int)
+
+    per_rq = max(1, max_papers // n_rq)
+    ranked = edges.sort_values("relevance", ascending=False, kind="stable")
+    kept_ids = ranked.groupby("rq").head(per_rq)["paper_id"].unique()
+
+    kept = edges["paper_id"].isin(kept_ids)
+    hidden = edges[~kept].groupby("rq")["paper_id"].nunique()
+    return edges[kept], hidden
+
+
+def _paper_grid(n):
+    """Rows per column so the paper block is roughly square."""
+    return max(1, math.ceil(math.sqrt(n * COL_WIDTH / ROW_HEIGHT)))
+
+
+def build_mapping_graph(edges, max_papers=MAX_PAPER_NODES):
+    """
+    RQ ↔ paper pyvis network. RQs form the left column; papers are packed
+    into columns, ordered by their first RQ so each RQ's papers stay together.
+    """
+    from pyvis.network import Network
+
+    edges, hidden = budget_edges(edges, max_papers=max_papers)
+
+    rqs = sorted(set(edges["rq"]) | set(hidden.index))
+    rq_index = {rq: i for i, rq in enumerate(rqs)}
+
+    papers = (
+        edges.assign(rq_pos=edges["rq"].map(rq_index))
+        .groupby("paper_id", sort=False)
+        .agg(rq_pos=("rq_pos", "min"), title=("title", "first"))
+        .sort_values(["rq_pos", "title"], kind="stable")
+    )
+
+    # "+N papers" nodes sit after the papers of their RQ.
+    n_nodes = len(papers) + len(hidden)
+    rows = _paper_grid(n_nodes)
+    height = rows * ROW_HEIGHT
+    rq_step = height / max(len(rqs), 1)
+
+    net = Network(
+        height="700px",
+        width="100%",
+        bgcolor="#ffffff",
+        font_color="black",
+        cdn_resources="local"
+    )
+
+    for rq, i in rq_index.items():
+        net.add_node(
+            f"RQ::{i}",
+            label=f"RQ {i+1}",
+            title=rq,
+            shape="box",
+            color="#4F81BD",
+            x=RQ_X,
+            y=float(i * rq_step),
+            physics=False,
+            size=30,
+        )
+
+    slots = [("paper", p.Index, p.title, p.rq_pos) for p in papers.itertuples()]
+    slots += [("more", rq, n, rq_index[rq]) for rq, n in hidden.items()]
+    slots.sort(key=lambda s: s[3])
+
+    for j, (kind, key, text, rq_pos) in enumerate(slots):
+        x = float((j // rows) * COL_WIDTH)
+        y = float((j % rows) * ROW_HEIGHT)
+
+        if kind == "paper":
+            title = str(text)
+            net.add_node(
+                f"P::{key}",
+                label=title[:40] + "..." if len(title) > 40 else title,
+                title=title,
+                shape="ellipse",
+                color="#9BBB59",
+                x=x,
+                y=y,
+                physics=False,
+                size=20,
+            )
+        else:
+            net.add_node(
+                f"MORE::{rq_pos}",
+                label=f"+{text} papers",
+                title=f"{text} lower-relevance papers of RQ {rq_pos+1} not drawn",
+                shape="box",
+                color="#D9D9D9",
+                x=x,
+                y=y,
+                physics=False,
+            )
+            net.add_edge(f"RQ::{rq_pos}", f"MORE::{rq_pos}", dashes=True)
+
+    for rq, pid in edges[["rq", "paper_id"]].itertuples(index=False):
+        net.add_edge(f"RQ::{rq_index[rq]}", f"P::{pid}")
+
+    net.toggle_physics(False)
+    return net
+
+
+@timed("render_mapping_graph_html")
+def render_mapping_graph_html(edges, max_papers=MAX_PAPER_NODES):
+    """
+    HTML for the RQ ↔ paper graph of `edges` (rq, paper_id, title,
+    relevance rows), built in memory and cached by the edge set.
+    """
+    key = _edge_key(edges, max_papers)
+
+    html = _HTML_CACHE.get(key)
+    if html is not None:
+        return html
+
+    net = build_mapping_graph(edges, max_papers=max_papers)
+    return _HTML_CACHE.put(key, link_local_assets(net.generate_html()))
@@ -1,7 +1,262 @@
-from pyvis.network import Network
+from pathlib import Path
+import hashlib
+import json
+import re
+from pipeline.timing import timed
+from viz.lru import LRUCache
 
-def build_interactive_graph(G):
-    net = Network(height="700px", bgcolor="#ffffff", font_color="black")
-    net.from_nx(G)
-    net.repulsion(node_distance=200)
-    return net
\ No newline at end of file
+# Budgets keep the graph HTML small enough for the browser regardless of corpus size.
+MAX_NODES = 150
+MAX_EDGES = 600
+
+# Bundled pyvis assets (vis-network 9.1.2, bindings, tom-select).
+LIB_DIR = Path(__file__).parents[1] / "lib"
+
+# Rendered HTML keyed by a hash of the edge list and render parameters.
+HTML_CACHE_SIZE = 16
+_HTML_CACHE = LRUCache(HTML_CACHE_SIZE)
+
+_LOCAL_REF_RE = re.compile(r'(src|href)="lib/')
+# pyvis points at cdnjs for vis-network itself even with cdn_resources="local".
+_CDN_VIS_JS_RE = re.compile(
+    r'<script src="https://cdnjs\.cloudflare\.com/ajax/libs/vis-network/[^"]*vis-network\.min\.js"[^>]*>\s*</script>'
+)
+_CDN_VIS_CSS_RE = re.compile(
+    r'<link rel="stylesheet" href="https://cdnjs\.cloudflare\.com/ajax/libs/vis-network/[^"]*vis-network\.min\.css"[^>]*/?>'
+)
+
+
+def disparity_backbone(G, alpha=0.05):
+    """
+    Keep edges that are significant for at least one endpoint under the
+    disparity filter (Serrano et al., 2009).
+    """
+    import networkx as nx
+
+    strength = dict(G.degree(weight="weight"))
+    degree = dict(G.degree())
+
+    def significance(node, w):
+        k = degree[node]
+        if k <= 1:
+            return 0.0
+        return (1 - w / strength[node]) ** (k - 1)
+
+    B = nx.Graph()
+    B.add_nodes_from(G.nodes(data=True))
+    for a, b, d in G.edges(data=True):
+        w = d.get("weight", 1)
+        if min(significance(a, w), significance(b, w)) < alpha:
+            B.add_edge(a, b, **d)
+
+    B.remove_nodes_from(list(nx.isolates(B)))
+    return B
+
+
+def percentile_backbone(G, percentile=90):
+    """Keep edges whose weight is at or above the given percentile."""
+    import networkx as nx
+
+    weights = sorted(d.get("weight", 1) for _, _, d in G.edges(data=True))
+    if not weights:
+        return G.copy()
+
+    idx = min(len(weights) - 1, int(len(weights) * percentile / 100))
+    cutoff = weights[idx]
+
+    B = nx.Graph()
+    B.add_edges_from(
+        (a, b, d) for a, b, d in G.edges(data=True)
+        if d.get("weight", 1) >= cutoff
+    )
+    return B
+
+
+def top_nodes(G, max_nodes=MAX_NODES):
+    """Induced subgraph on the `max_nodes` nodes with highest weighted degree."""
+    if G.number_of_nodes() <= max_nodes:
+        return G
+
+    strength = G.degree(weight="weight")
+    keep = sorted(strength, key=lambda x: x[1], reverse=True)[:max_nodes]
+    return G.subgraph(n for n, _ in keep).copy()
+
+
+def top_edges(G, max_edges=MAX_EDGES):
+    """Drop the lightest edges until at most `max_edges` remain."""
+    import networkx as nx
+
+    if G.number_of_edges() <= max_edges:
+        return G
+
+    edges = sorted(
+        G.edges(data=True),
+        key=lambda e: e[2].get("weight", 1),
+        reverse=True
+    )[:max_edges]
+
+    H = nx.Graph()
+    H.add_edges_from(edges)
+    nx.set_node_attributes(H, {n: G.nodes[n] for n in H})
+    return H
+
+
+def collapse_communities(G, seed=42):
+    """
+    Replace each community by a super-node labelled with its strongest
+    keywords. Edge weights between communities are summed.
+    """
+    import networkx as nx
+
+    communities = nx.community.louvain_communities(G, weight="weight", seed=seed)
+    strength = dict(G.degree(weight="weight"))
+
+    membership = {}
+    C = nx.Graph()
+    for members in communities:
+        top = sorted(members, key=lambda n: strength[n], reverse=True)[:3]
+        label = " / ".join(top)
+        C.add_node(label, size=len(members), title=", ".join(sorted(members)))
+        for n in members:
+            membership[n] = label
+
+    for a, b, d in G.edges(data=True):
+        ca, cb = membership[a], membership[b]
+        if ca == cb:
+            continue
+        w = d.get("weight", 1)
+        if C.has_edge(ca, cb):
+            C[ca][cb]["weight"] += w
+        else:
+            C.add_edge(ca, cb, weight=w)
+
+    return C
+
+
+@timed("reduce_graph")
+def reduce_graph(
+    G,
+    max_nodes=MAX_NODES,
+    max_edges=MAX_EDGES,
+    method="disparity",
+    alpha=0.05,
+    percentile=90,
+    collapse=False,
+):
+    """
+    Reduce a co-occurrence graph to a renderable backbone:
+    backbone filter -> node budget -> optional community collapse -> edge budget.
+    """
+    if method == "disparity":
+        G = disparity_backbone(G, alpha=alpha)
+    elif method == "percentile":
+        G = percentile_backbone(G, percentile=percentile)
+
+    G = top_nodes(G, max_nodes=max_nodes)
+
+    if collapse and G.number_of_nodes() > 0:
+        G = collapse_communities(G)
+
+    return top_edges(G, max_edges=max_edges)
+
+
+def build_interactive_graph(G, reduce=True, scale=1000, **reduce_kwargs):
+    """
+    Build a static pyvis network. Coordinates are computed server-side,
+    so browser physics stays off.
+    """
+    import networkx as nx
+    from pyvis.network import Network
+
+    if reduce:
+        G = reduce_graph(G, **reduce_kwargs)
+
+    pos = nx.spring_layout(G, weight="weight", seed=42)
+    strength = dict(G.degree(weight="weight"))
+
+    net = Network(
+        height="700px",
+        bgcolor="#ffffff",
+        font_color="black",
+        cdn_resources="local"
+    )
+
+    for n, attrs in G.nodes(data=True):
+        x, y = pos[n]
+        net.add_node(
+            n,
+            label=n,
+            title=attrs.get("title", n),
+            value=attrs.get("size", strength.get(n, 1)),
+            x=float(x * scale),
+            y=float(y * scale),
+            physics=False,
+        )
+
+    for a, b, d in G.edges(data=True):
+        net.add_edge(a, b, value=d.get("weight", 1))
+
+    net.toggle_physics(False)
+    return net
+
+
+def asset_base_url():
+    """
+    URL under which Streamlit serves the bundled lib/ directory.
+    lib/ is registered as a static component path (a no-op outside a
+    script run), so the browser fetches and caches the assets instead of
+    every graph page carrying them inline.
+    """
+    import streamlit as st
+    import streamlit.components.v1 as components
+
+    assets = components.declare_component("pyvis_assets", path=str(LIB_DIR))
+    base = (st.get_option("server.baseUrlPath") or "").strip("/")
+    return f"{'/' + base if base else ''}/component/{assets.name}"
+
+
+def link_local_assets(html, base_url=None):
+    """
+    Point pyvis' lib/ and vis-network CDN references at the served lib/
+    copies; the HTML keeps only <script src>/<link href> tags.
+    """
+    base_url = base_url or asset_base_url()
+    html = _LOCAL_REF_RE.sub(lambda m: f'{m.group(1)}="{base_url}/', html)
+    html = _CDN_VIS_JS_RE.sub(
+        f'<script src="{base_url}/vis-9.1.2/vis-network.min.js"></script>', html
+    )
+    return _CDN_VIS_CSS_RE.sub(
+        f'<link rel="stylesheet" href="{base_url}/vis-9.1.2/vis-network.css" />', html
+    )
+
+
+def graph_fingerprint(G, **params):
+    """Stable hash of a graph's weighted edge list plus render parameters."""
+    edges = sorted(
+        (str(a), str(b), d.get("weight", 1)) if str(a) <= str(b)
+        else (str(b), str(a), d.get("weight", 1))
+        for a, b, d in G.edges(data=True)
+    )
+    payload = json.dumps([edges, sorted(params.items())], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+@timed("render_graph_html")
+def render_graph_html(G, version=None, **kwargs):
+    """
+    Build the interactive graph as an HTML string in memory, reusing the
+    cached page when the graph and parameters are unchanged.
+    `version` identifies G (e.g. corpus + filter fingerprint) and is then
+    used instead of hashing the edge list.
+    """
+    if version is None:
+        key = graph_fingerprint(G, **kwargs)
+    else:
+        key = (str(version), tuple(sorted(kwargs.items())))
+
+    html = _HTML_CACHE.get(key)
+    if html is not None:
+        return html
+
+    net = build_interactive_graph(G, **kwargs)
+    return _HTML_CACHE.put(key, link_local_assets(net.generate_html()))
@@ -0,0 +1,186 @@
+"""
+Paginated result tables for the listing pages.
+
+    paged_table(filtered, key="acl_batch", sort_by="year", ascending=False)
+
+The frame is sorted server-side and only the current page (page_size rows,
+long text cut to max_chars) is sent to the browser. Sorting
+uses one lexsort over just the sort columns, never a full-frame copy, and
+the resulting positions are cached per content of those columns, so paging
+through an unchanged result is a single iloc slice. Callers pass a
+`version` of the filtered frame (data version + filter values) so the
+cache lookup does not hash the frame at all.
+Full text of a row on the page is shown on demand. Payload and render
+time depend on the page size, not on the number of results.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from pipeline.exports import frame_version
+from viz.lru import LRUCache
+
+PAGE_SIZES = [25, 50, 100, 200]
+MAX_CHARS = 120
+DEFAULT_SORT = "(default order)"
+
+POSITIONS_CACHE_SIZE = 16
+_POSITIONS_CACHE = LRUCache(POSITIONS_CACHE_SIZE)
+
+
+def _sort_key(values, ascending):
+    """Integer/float key where smaller sorts first and missing values go last."""
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        key = values.to_numpy(dtype=float, na_value=np.nan)
+        key = key if ascending else -key
+        return np.where(np.isnan(key), np.inf, key)
+
+    codes, uniques = pd.factorize(values.astype("string").str.lower(), sort=True)
+    key = codes if ascending else len(uniques) - 1 - codes
+    return np.where(codes < 0, len(uniques), key)
+
+
+def _content_version(frame):
+    try:
+        return frame_version(frame)
+    except (TypeError, ValueError):
+        # List/dict cells cannot be hashed by pandas; their text can.
+        return frame_version(frame.astype(str))
+
+
+def sort_positions(df, by, ascending=True, version=None):
+    """
+    iloc positions of `df` ordered by column(s) `by`; ties keep row order.
+    Cached per (version, sort spec); without a version the sort columns
+    are hashed instead.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    ascending = [ascending] * len(by) if isinstance(ascending, bool) else list(ascending)
+
+    if version is None:
+        version = _content_version(df[by])
+    key = (version, tuple(by), tuple(ascending))
+    positions = _POSITIONS_CACHE.get(key)
+    if positions is not None:
+        return positions
+
+    keys = [_sort_key(df[col], asc) for col, asc in zip(by, ascending)]
+    # lexsort: last key is the primary one; row position breaks ties.
+    positions = np.lexsort([np.arange(len(df))] + keys[::-1])
+    positions.flags.writeable = False
+    return _POSITIONS_CACHE.put(key, positions)
+
+
+def page_frame(df, by=None, ascending=True, page=0, page_size=50, version=None):
+    """Rows of one page of `df` sorted by `by` (None keeps the frame order)."""
+    start = page * page_size
+    if by:
+        positions = sort_positions(df, by, ascending, version=version)
+        return df.iloc[positions[start:start + page_size]]
+    return df.iloc[start:start + page_size]
+
+
+def _long_text(df, max_chars):
+    """Text columns of `df` with at least one value longer than `max_chars`."""
+    return [
+        c for c in df.columns
+        if (df[c].dtype == object or pd.api.types.is_string_dtype(df[c].dtype))
+        and (df[c].astype("string").str.len() > max_chars).any()
+    ]
+
+
+def truncate_text(df, max_chars=MAX_CHARS, columns=None):
+    """Copy of `df` with long text in `columns` cut to `max_chars` + "…"."""
+    out = df.copy()
+    for col in columns if columns is not None else _long_text(df, max_chars):
+        text = out[col].astype("string")
+        long = (text.str.len() > max_chars).fillna(False)
+        out[col] = text.where(~long, text.str.slice(0, max_chars) + "…")
+    return out
+
+
+def paged_table(
+    df,
+    key,
+    sort_by=None,
+    ascending=True,
+    page_size=50,
+    max_chars=MAX_CHARS,
+    truncate=None,
+    version=None,
+    **dataframe_kwargs,
+):
+    """
+    Streamlit table showing one page of `df` at a time.
+
+    `sort_by` / `ascending` are the default order (a column or list of
+    columns); the user can re-sort by any single column. `truncate` limits
+    cutting to the given columns (default: any text column with long
+    values). Widget keys are prefixed with `key`, so several tables can
+    share a page. `version` is any hashable that changes whenever the
+    rows of `df` do (e.g. (reg.version, filter values)); without it the
+    sort columns are hashed on every rerun.
+    """
+    import streamlit as st
+
+    n = len(df)
+    c1, c2, c3, c4 = st.columns([3, 2, 2, 2])
+
+    sort_col = c1.selectbox(
+        "Sort by",
+        [DEFAULT_SORT] + list(df.columns),
+        key=f"{key}_sort",
+    )
+    if sort_col == DEFAULT_SORT:
+        by, asc = sort_by, ascending
+    else:
+        asc = c2.radio(
+            "Order", ["Ascending", "Descending"], horizontal=True, key=f"{key}_order"
+        ) == "Ascending"
+        by = sort_col
+
+    size = c3.selectbox(
+        "Rows per page",
+        PAGE_SIZES,
+        index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 1,
+        key=f"{key}_size",
+    )
+    n_pages = max(1, math.ceil(n / size))
+    # Filters may shrink the result below the remembered page.
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = n_pages
+    page = c4.number_input(
+        f"Page (of {n_pages})", min_value=1, max_value=n_pages, step=1,
+        key=f"{key}_page",
+    )
+    page = int(page) - 1
+
+    full = page_frame(
+        df, by, asc, page, size,
+        version=None if version is None else (key, version),
+    )
+    cut = truncate if truncate is not None else _long_text(full, max_chars)
+
+    st.dataframe(
+        truncate_text(full, max_chars, cut),
+        **{"use_container_width": True, **dataframe_kwargs},
+    )
+    st.caption(
+        f"Rows {page * size + 1 if n else 0}–{page * size + len(full)} of {n}"
+    )
+
+    if cut and len(full):
+        with st.expander("Show full text of a row"):
+            labels = full[full.columns[0]].astype(str).str.slice(0, 80).tolist()
+            row = st.selectbox(
+                "Row",
+                range(len(full)),
+                format_func=lambda i: f"{page * size + i + 1}. {labels[i]}",
+                key=f"{key}_expand",
+            )
+            record = full.iloc[row]
+            for col in cut:
+                st.markdown(f"**{col}**")
+                st.write(record[col])
@@ -0,0 +1,152 @@
+"""
+Theme → RQ → method → paper Sankey built from the registry.
+
+    spec = registry_sankey(load_registry(), max_papers=40)
+    fig = go.Figure(spec)
+
+Flows are mapping counts from one groupby per level pair. Themes come
+from the RQ code prefix ("PRQ2 - ..." -> "PRQ"). RQs and papers beyond
+the node budget, with the smallest flows, are bundled into one "Other"
+node per level. The figure spec is a plain dict, cached per registry
+version and budget.
+"""
+
+import pandas as pd
+
+from pipeline.timing import timed
+from viz.lru import LRUCache
+
+MAX_RQS = 20
+MAX_PAPERS = 40
+LABEL_CHARS = 60
+
+LEVELS = ("theme", "rq", "method", "paper")
+LEVEL_COLORS = {
+    "theme": "#4F81BD",
+    "rq": "#8064A2",
+    "method": "#F79646",
+    "paper": "#9BBB59",
+}
+OTHER_COLOR = "#D9D9D9"
+OTHER_RQS = "Other RQs"
+OTHER_PAPERS = "Other papers"
+
+SPEC_CACHE_SIZE = 8
+_SPEC_CACHE = LRUCache(SPEC_CACHE_SIZE)
+
+
+def rq_theme(rq):
+    """Theme code of research question texts: the letters before the RQ number."""
+    return (
+        rq.str.extract(r"^\s*([A-Za-z]+)\s*\d", expand=False)
+        .str.upper()
+        .fillna("Unassigned")
+    )
+
+
+def _bundle(labels, weights, budget, other):
+    """Keep the `budget` labels with the largest total weight; rename the rest."""
+    totals = weights.groupby(labels).sum()
+    if len(totals) <= budget:
+        return labels
+    kept = totals.nlargest(budget).index
+    return labels.where(labels.isin(kept), other)
+
+
+def sankey_frame(papers, max_rqs=MAX_RQS, max_papers=MAX_PAPERS):
+    """One row per mapping with its theme, rq, method and paper node label."""
+    df = pd.DataFrame({
+        "theme": rq_theme(papers["rq"]),
+        "rq": papers["rq"].fillna(""),
+        "method": papers["method"].fillna("Unspecified"),
+        "paper": papers["title"].fillna(papers["paper_id"]).fillna(""),
+        "relevance": papers["relevance"].fillna(0.0),
+    })
+
+    ones = pd.Series(1, index=df.index)
+    df["rq"] = _bundle(df["rq"], ones, max_rqs, OTHER_RQS)
+    df["paper"] = _bundle(df["paper"], df["relevance"], max_papers, OTHER_PAPERS)
+    return df
+
+
+def sankey_links(df):
+    """(nodes, links): nodes has level/label, links has source/target/value."""
+    flows = [
+        df.groupby([a, b], sort=True).size().rename("value").reset_index()
+        .rename(columns={a: "a", b: "b"})
+        .assign(level_a=a, level_b=b)
+        for a, b in zip(LEVELS, LEVELS[1:])
+    ]
+    flows = pd.concat(flows, ignore_index=True)
+
+    keys = pd.concat([
+        flows["level_a"] + "::" + flows["a"],
+        flows["level_b"] + "::" + flows["b"],
+    ], ignore_index=True)
+    codes, uniques = pd.factorize(keys)
+
+    n = len(flows)
+    links = pd.DataFrame({
+        "source": codes[:n],
+        "target": codes[n:],
+        "value": flows["value"].to_numpy(),
+    })
+    nodes = pd.Series(uniques).str.split("::", n=1, expand=True)
+    nodes.columns = ["level", "label"]
+    return nodes, links
+
+
+def _short(text):
+    return text if len(text) <= LABEL_CHARS else text[:LABEL_CHARS] + "…"
+
+
+def sankey_spec(nodes, links, title):
+    """Plotly figure dict for go.Figure(...)."""
+    is_other = nodes["level"].isin(["rq", "paper"]) & nodes["label"].isin([OTHER_RQS, OTHER_PAPERS])
+    colors = nodes["level"].map(LEVEL_COLORS).where(~is_other, OTHER_COLOR)
+
+    return {
+        "data": [{
+            "type": "sankey",
+            "arrangement": "snap",
+            "node": {
+                "label": [_short(s) for s in nodes["label"]],
+                "customdata": nodes["label"].tolist(),
+                "hovertemplate": "%{customdata}<br>%{value} mappings<extra></extra>",
+                "color": colors.tolist(),
+                "pad": 18,
+                "thickness": 22,
+                "line": {"color": "black", "width": 0.5},
+            },
+            "link": {
+                "source": links["source"].tolist(),
+                "target": links["target"].tolist(),
+                "value": links["value"].tolist(),
+            },
+        }],
+        "layout": {
+            "title": title,
+            "font": {"size": 12},
+            "height": max(700, 14 * int((nodes["level"] == "paper").sum())),
+        },
+    }
+
+
+@timed("registry_sankey")
+def registry_sankey(reg, max_rqs=MAX_RQS, max_papers=MAX_PAPERS):
+    """Figure spec of the registry's theme → RQ → method → paper flows."""
+    key = (reg.version, max_rqs, max_papers)
+    spec = _SPEC_CACHE.get(key) if reg.version is not None else None
+    if spec is not None:
+        return spec
+
+    df = sankey_frame(reg.papers, max_rqs=max_rqs, max_papers=max_papers)
+    nodes, links = sankey_links(df)
+    spec = sankey_spec(
+        nodes, links, "Sankey Diagram: Themes → Research Questions → Methods → Papers"
+    )
+
+    if reg.version is not None:
+        _SPEC_CACHE.put(key, spec)
+
+    return spec
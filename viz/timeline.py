@@ -1,7 +1,10 @@
 import pandas as pd
-import matplotlib.pyplot as plt
+from pipeline.timing import timed
 
+@timed("plot_keyword_trend")
 def plot_keyword_trend(df, keyword):
+    import matplotlib.pyplot as plt
+
     trend = df[df["keywords"].apply(lambda x: keyword in x)]
     counts = trend.groupby("year").size()
 
@@ -9,4 +12,20 @@ def plot_keyword_trend(df, keyword):
     counts.plot(ax=ax, marker="o")
     ax.set_title(f"Keyword Evolution: {keyword}")
     ax.set_ylabel("Publications")
-    return fig
\ No newline at end of file
+    return fig
+
+
+def keyword_trend_table(df, top_n=50):
+    """
+    Year x keyword publication counts for the `top_n` most frequent keywords.
+    """
+    exploded = df[["year", "keywords"]].explode("keywords").dropna()
+    top = exploded["keywords"].value_counts().head(top_n).index
+
+    return (
+        exploded[exploded["keywords"].isin(top)]
+        .groupby(["year", "keywords"])
+        .size()
+        .unstack(fill_value=0)
+        .sort_index()
+    )
@@ -1,33 +1,95 @@
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
 from collections import Counter
+import hashlib
+import io
+import json
+from pipeline.timing import timed
+from viz.lru import LRUCache
 
+# Rendered PNG bytes keyed by a hash of (top-N frequencies, render params).
+PNG_CACHE_SIZE = 32
+_PNG_CACHE = LRUCache(PNG_CACHE_SIZE)
 
-def plot_wordcloud(df):
+FULL_SIZE = (1200, 600)
+PREVIEW_SIZE = (600, 300)
+
+
+def keyword_frequencies(df, max_words=200):
     """
-    Safely plot a word cloud.
-    Returns None if no words are available.
+    Count keywords and keep only the top `max_words`.
+    WordCloud drops the rest anyway, so they never need to be hashed.
     """
-
     words = Counter()
 
     for kws in df["keywords"]:
         if isinstance(kws, list):
             words.update(kws)
 
-    # 🔒 HARD GUARD (THIS PREVENTS YOUR ERROR)
-    if len(words) == 0:
+    return dict(words.most_common(max_words))
+
+
+def _cache_key(freqs, width, height, max_words):
+    payload = json.dumps(
+        [sorted(freqs.items()), width, height, max_words],
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+@timed("render_wordcloud_png")
+def render_wordcloud_png(df, max_words=200, preview=False, freqs=None):
+    """
+    Render the word cloud as PNG bytes, reusing a cached image when the
+    top-N frequency table and render parameters are unchanged.
+    `freqs` is an already counted {keyword: count} table (e.g.
+    KeywordIndex.top); `df` is only counted when it is not given.
+    Returns None if no words are available.
+    """
+    if freqs is None:
+        freqs = keyword_frequencies(df, max_words=max_words)
+    elif len(freqs) > max_words:
+        freqs = dict(Counter(freqs).most_common(max_words))
+
+    if len(freqs) == 0:
         return None
 
+    width, height = PREVIEW_SIZE if preview else FULL_SIZE
+    key = _cache_key(freqs, width, height, max_words)
+
+    png = _PNG_CACHE.get(key)
+    if png is not None:
+        return png
+
+    from wordcloud import WordCloud
+
     wc = WordCloud(
-        width=1200,
-        height=600,
+        width=width,
+        height=height,
+        max_words=max_words,
         background_color="white",
         collocations=False
-    ).generate_from_frequencies(words)
+    ).generate_from_frequencies(freqs)
+
+    buf = io.BytesIO()
+    wc.to_image().save(buf, format="PNG")
+    return _PNG_CACHE.put(key, buf.getvalue())
+
+
+def plot_wordcloud(df, max_words=200, preview=False):
+    """
+    Safely plot a word cloud.
+    Returns None if no words are available.
+    """
+
+    import matplotlib.pyplot as plt
+
+    png = render_wordcloud_png(df, max_words=max_words, preview=preview)
+
+    # 🔒 HARD GUARD (THIS PREVENTS YOUR ERROR)
+    if png is None:
+        return None
 
     fig, ax = plt.subplots(figsize=(12, 6))
-    ax.imshow(wc)
+    ax.imshow(plt.imread(io.BytesIO(png), format="png"))
     ax.axis("off")
 
     return fig
@@ -51,4 +113,4 @@ def plot_wordcloud(df):
 #     fig, ax = plt.subplots(figsize=(12, 6))
 #     ax.imshow(wc)
 #     ax.axis("off")
-#     return fig
\ No newline at end of file
+#     return fig